@@ -8,6 +8,7 @@ from .observability.langfuse_tracing import initialize_langfuse_tracing
 initialize_langfuse_tracing()
 setup_logging()
 
+from .agent import root_agent  # noqa: E402
 
 __version__ = "0.1.0"
 __all__ = ["root_agent"]
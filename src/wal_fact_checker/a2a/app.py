@@ -7,7 +7,10 @@ thin `AgentExecutor` bridge to the Google ADK `Runner` hosting our
 
 from __future__ import annotations
 
-from typing import Final
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any, Final
 
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
@@ -23,7 +26,9 @@ from google.adk.sessions.in_memory_session_service import InMemorySessionService
 
 from wal_fact_checker.a2a.executor import WalAgentExecutor
 from wal_fact_checker.agent import root_agent
+from wal_fact_checker.core.llm import prewarm_gemini_connection
 from wal_fact_checker.core.settings import settings
+from wal_fact_checker.core.tools import close_http_client, prewarm_http_client
 
 RPC_URL: Final[str] = f"http://{settings.host}:{settings.port}/"
 
@@ -56,13 +61,13 @@ public_agent_card = AgentCard(
     version="1.0.0",
     default_input_modes=["text"],
     default_output_modes=["application/json"],
-    capabilities=AgentCapabilities(state_transition_history=False, streaming=False),
+    capabilities=AgentCapabilities(state_transition_history=False, streaming=True),
     skills=[skill],
     supports_authenticated_extended_card=True,
 )
 
 
-async def _create_runner() -> Runner:
+def _create_runner() -> Runner:
     """Create an ADK `Runner` hosting the `root_agent` with in-memory services.
 
     Returns:
@@ -78,8 +83,23 @@ async def _create_runner() -> Runner:
     )
 
 
+# Built once at import so the first request doesn't pay for it
+runner = _create_runner()
+
+
+@asynccontextmanager
+async def lifespan(_app: Any) -> AsyncIterator[None]:
+    """Pre-warm upstream connections on startup and release them on shutdown."""
+    # Pay the TCP+TLS handshakes before the first request instead of during it
+    await asyncio.gather(prewarm_gemini_connection(), prewarm_http_client())
+    try:
+        yield
+    finally:
+        await close_http_client()
+
+
 # AgentExecutor bridging ADK↔A2A (custom implementation)
-agent_executor = WalAgentExecutor(runner=_create_runner)
+agent_executor = WalAgentExecutor(runner=runner)
 
 # Request handler and task store per A2A Protocol
 request_handler = DefaultRequestHandler(
@@ -93,4 +113,4 @@ _server = A2AStarletteApplication(
 )
 
 # ASGI app for uvicorn/gunicorn
-a2a_app = _server.build()
+a2a_app = _server.build(lifespan=lifespan)
@@ -6,11 +6,13 @@ bridges requests to the Google ADK `Runner` hosting our orchestrator agent.
 
 from __future__ import annotations
 
+import asyncio
 import inspect
+import itertools
 import logging
-import uuid
 from collections.abc import Awaitable, Callable
 from datetime import datetime, timezone
+from time import time
 from typing import Any
 
 from a2a.server.agent_execution import AgentExecutor
@@ -26,7 +28,7 @@ from a2a.types import (
     TaskStatusUpdateEvent,
     TextPart,
 )
-from google.adk.a2a.converters.event_converter import convert_event_to_a2a_events
+from google.adk.a2a.converters.event_converter import convert_event_to_a2a_message
 from google.adk.a2a.converters.part_converter import (
     convert_a2a_part_to_genai_part,
     convert_genai_part_to_a2a_part,
@@ -41,6 +43,19 @@ from typing_extensions import override
 
 logger = logging.getLogger(__name__)
 
+# A2A message/artifact ids are opaque strings; task id + counter is unique
+_id_counter = itertools.count()
+
+
+def _new_id(context: RequestContext) -> str:
+    """Return a unique id for a message or artifact published for this task."""
+    return f"{context.task_id}-{next(_id_counter)}"
+
+
+def _utcnow_iso() -> str:
+    """Return the current UTC time as an ISO-8601 string."""
+    return datetime.fromtimestamp(time(), tz=timezone.utc).isoformat()
+
 
 class WalAgentExecutorConfig(BaseModel):
     """Configuration for `WalAgentExecutor`.
@@ -48,10 +63,16 @@ class WalAgentExecutorConfig(BaseModel):
     Attributes:
         a2a_part_converter: Converter for A2A part → GenAI part
         gen_ai_part_converter: Converter for GenAI part → A2A part
+        progress_agent_names: Agents whose final responses are streamed as
+            progress updates; other agents' output (structured claims, gap
+            questions, research answers) is internal to the pipeline
     """
 
     a2a_part_converter: Any = convert_a2a_part_to_genai_part
     gen_ai_part_converter: Any = convert_genai_part_to_a2a_part
+    progress_agent_names: frozenset[str] = frozenset(
+        {"EvidenceAdjudicatorAgent", "ReportTransformationAgent"}
+    )
 
 
 class WalAgentExecutor(AgentExecutor):
@@ -66,19 +87,24 @@ class WalAgentExecutor(AgentExecutor):
         super().__init__()
         self._runner: Runner | Callable[..., Runner | Awaitable[Runner]] = runner
         self._config: WalAgentExecutorConfig = config or WalAgentExecutorConfig()
+        self._runner_lock = asyncio.Lock()
 
     async def _resolve_runner(self) -> Runner:
         """Resolve a `Runner` from a possibly callable provider."""
         if isinstance(self._runner, Runner):
             return self._runner
-        if callable(self._runner):
-            result = self._runner()
-            if inspect.iscoroutine(result):
-                resolved = await result
-            else:
-                resolved = result
-            self._runner = resolved
-            return resolved
+        # Serialize the lazy build so concurrent first requests share one Runner
+        async with self._runner_lock:
+            if isinstance(self._runner, Runner):
+                return self._runner
+            if callable(self._runner):
+                result = self._runner()
+                if inspect.iscoroutine(result):
+                    resolved = await result
+                else:
+                    resolved = result
+                self._runner = resolved
+                return resolved
         raise TypeError(f"Unsupported runner type: {type(self._runner)}")
 
     @override
@@ -92,6 +118,9 @@ class WalAgentExecutor(AgentExecutor):
         if not context.message:
             raise ValueError("A2A request must include a message")
 
+        # Submitted and working are published back-to-back; share one timestamp
+        received_at = _utcnow_iso()
+
         # If this is a new task, publish submitted
         if not context.current_task:
             await event_queue.enqueue_event(
@@ -100,7 +129,7 @@ class WalAgentExecutor(AgentExecutor):
                     status=TaskStatus(
                         state=TaskState.submitted,
                         message=context.message,
-                        timestamp=datetime.now(timezone.utc).isoformat(),
+                        timestamp=received_at,
                     ),
                     context_id=context.context_id,
                     final=False,
@@ -108,13 +137,13 @@ class WalAgentExecutor(AgentExecutor):
             )
 
         try:
-            await self._handle_request(context, event_queue)
+            await self._handle_request(context, event_queue, received_at)
         except Exception as err:
             logger.exception("A2A request handling failed")
             await self._publish_failure(context, event_queue, err)
 
     async def _handle_request(
-        self, context: RequestContext, event_queue: EventQueue
+        self, context: RequestContext, event_queue: EventQueue, received_at: str
     ) -> None:
         runner = await self._resolve_runner()
 
@@ -122,19 +151,14 @@ class WalAgentExecutor(AgentExecutor):
             context, self._config.a2a_part_converter
         ).model_dump()
 
-        session = await self._prepare_session(context, run_args, runner)
-        invocation_ctx = runner._new_invocation_context(  # pylint: disable=protected-access
-            session=session,
-            new_message=run_args["new_message"],
-            run_config=run_args["run_config"],
-        )
+        await self._prepare_session(context, run_args, runner)
 
         await event_queue.enqueue_event(
             TaskStatusUpdateEvent(
                 task_id=context.task_id,
                 status=TaskStatus(
                     state=TaskState.working,
-                    timestamp=datetime.now(timezone.utc).isoformat(),
+                    timestamp=received_at,
                 ),
                 context_id=context.context_id,
                 final=False,
@@ -146,25 +170,52 @@ class WalAgentExecutor(AgentExecutor):
             )
         )
 
-        # Stream ADK events and convert to A2A events
+        # Stream user-facing agents' final responses as progress updates as
+        # soon as they arrive; the last message with content becomes the task
+        # artifact. A run whose last final response is an error fails.
         last_status_message: Message | None = None
+        last_error: str | None = None
         async for adk_event in runner.run_async(**run_args):
-            for a2a_event in convert_event_to_a2a_events(
-                adk_event,
-                invocation_ctx,
-                context.task_id,
-                context.context_id,
-                self._config.gen_ai_part_converter,
-            ):
-                # Track last task status message if present
-                if (
-                    isinstance(a2a_event, TaskStatusUpdateEvent)
-                    and a2a_event.status.message is not None
-                ):
-                    last_status_message = a2a_event.status.message
-                # await event_queue.enqueue_event(a2a_event)
+            if adk_event.error_code:
+                last_error = adk_event.error_message or adk_event.error_code
+                logger.warning(
+                    "A2A run produced an error event",
+                    extra={
+                        "json_fields": {
+                            "author": adk_event.author,
+                            "error_code": adk_event.error_code,
+                        }
+                    },
+                )
+                continue
+            if not adk_event.is_final_response():
+                continue
+            message = convert_event_to_a2a_message(
+                adk_event, part_converter=self._config.gen_ai_part_converter
+            )
+            if message is None:
+                continue
+            last_status_message = message
+            last_error = None
+            if adk_event.author not in self._config.progress_agent_names:
+                continue
+            await event_queue.enqueue_event(
+                TaskStatusUpdateEvent(
+                    task_id=context.task_id,
+                    status=TaskStatus(
+                        state=TaskState.working,
+                        message=message,
+                        timestamp=_utcnow_iso(),
+                    ),
+                    context_id=context.context_id,
+                    final=False,
+                )
+            )
 
         # Publish finalization
+        if last_error is not None:
+            await self._publish_failure(context, event_queue, RuntimeError(last_error))
+            return
         await self._publish_completion(context, event_queue, last_status_message)
 
     async def _prepare_session(
@@ -198,7 +249,7 @@ class WalAgentExecutor(AgentExecutor):
                     last_chunk=True,
                     context_id=context.context_id,
                     artifact=Artifact(
-                        artifact_id=str(uuid.uuid4()),
+                        artifact_id=_new_id(context),
                         parts=last_status_message.parts,
                     ),
                 )
@@ -208,7 +259,7 @@ class WalAgentExecutor(AgentExecutor):
                     task_id=context.task_id,
                     status=TaskStatus(
                         state=TaskState.completed,
-                        timestamp=datetime.now(timezone.utc).isoformat(),
+                        timestamp=_utcnow_iso(),
                     ),
                     context_id=context.context_id,
                     final=True,
@@ -220,9 +271,9 @@ class WalAgentExecutor(AgentExecutor):
                     task_id=context.task_id,
                     status=TaskStatus(
                         state=TaskState.completed,
-                        timestamp=datetime.now(timezone.utc).isoformat(),
+                        timestamp=_utcnow_iso(),
                         message=Message(
-                            message_id=str(uuid.uuid4()),
+                            message_id=_new_id(context),
                             role=Role.agent,
                             parts=[TextPart(text="Done")],
                         ),
@@ -240,9 +291,9 @@ class WalAgentExecutor(AgentExecutor):
                 task_id=context.task_id,
                 status=TaskStatus(
                     state=TaskState.failed,
-                    timestamp=datetime.now(timezone.utc).isoformat(),
+                    timestamp=_utcnow_iso(),
                     message=Message(
-                        message_id=str(uuid.uuid4()),
+                        message_id=_new_id(context),
                         role=Role.agent,
                         parts=[TextPart(text=str(err))],
                     ),
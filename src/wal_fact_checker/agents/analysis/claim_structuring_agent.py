@@ -3,22 +3,346 @@
 
 from __future__ import annotations
 
+import hashlib
+import logging
+
+import orjson
 from google.adk.agents import LlmAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
 from google.adk.planners import BuiltInPlanner
 from google.genai import types
+from pydantic import ValidationError
 
-from wal_fact_checker.core.models import StructuredClaimsOutput
+from wal_fact_checker.core.llm import get_gemini_model, get_gemini_semaphore
+from wal_fact_checker.core.models import (
+    BatchedStructuredClaimsOutput,
+    StructuredClaimsOutput,
+)
 from wal_fact_checker.core.settings import settings
-from wal_fact_checker.utils.callbacks import inject_current_date_before_model
+from wal_fact_checker.core.tools import groq_client
+from wal_fact_checker.utils.batching import MicroBatcher
+from wal_fact_checker.utils.callbacks import (
+    create_adaptive_thinking_callbacks,
+    inject_current_date_before_model,
+    is_easy_input,
+    use_cached_instruction_before_model,
+)
+from wal_fact_checker.utils.embedding_service import embedding_service
+from wal_fact_checker.utils.response_store import content_key, get_response_store
+from wal_fact_checker.utils.semantic_cache import SemanticCache
+
+logger = logging.getLogger(__name__)
+
+MODEL = settings.CLAIM_STRUCTURING_MODEL
+
+# Near-duplicate inputs (reposts, retries) reuse earlier structured claims.
+# The threshold is deliberately strict: a false hit returns another text's claims.
+SEMANTIC_CACHE_THRESHOLD = 0.97
+SEMANTIC_CACHE_MAX_ENTRIES = 1000
+MAX_PENDING_CACHE_ENTRIES = 100
+
+claim_structuring_cache = SemanticCache(
+    threshold=SEMANTIC_CACHE_THRESHOLD, max_entries=SEMANTIC_CACHE_MAX_ENTRIES
+)
+# Cache keys and embeddings computed on a miss, kept until the response is stored
+_pending_cache_entries: dict[str, tuple[str, str, list[float], str]] = {}
+
+_FAST_MODEL_INSTRUCTION_SUFFIX = f"""
+    ## RESPONSE FORMAT
+
+    Respond with a single JSON object matching this JSON schema:
+    {orjson.dumps(StructuredClaimsOutput.model_json_schema()).decode()}
+    """
+
+_BATCH_INSTRUCTION_SUFFIX = """
+    ## BATCHED INPUT
+
+    The input contains several independent documents, each wrapped in
+    <doc id="...">...</doc>. Structure every document on its own, exactly as
+    described above, numbering its claim IDs from C1. Return one entry per
+    document in "documents", with "id" set to the document's id.
+    """
+
+
+def _system_instruction_text(llm_request: LlmRequest) -> str:
+    system_instruction = llm_request.config.system_instruction
+    if isinstance(system_instruction, types.Content):
+        return "".join(part.text or "" for part in system_instruction.parts or [])
+    return str(system_instruction or "")
+
+
+def _cache_namespace(llm_request: LlmRequest) -> str:
+    """Key cache entries by model and the exact system instruction (incl. date)."""
+    instruction_text = _system_instruction_text(llm_request)
+    instruction_hash = hashlib.sha256(instruction_text.encode()).hexdigest()[:16]
+    return f"{llm_request.model}:{instruction_hash}"
+
+
+def _user_text(callback_context: CallbackContext) -> str:
+    user_content = callback_context.user_content
+    if not user_content or not user_content.parts:
+        return ""
+    return "".join(part.text or "" for part in user_content.parts)
+
+
+async def lookup_structured_claims_cache(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> LlmResponse | None:
+    """Return cached structured claims for an identical or near-duplicate input."""
+    text = _user_text(callback_context)
+    if not text.strip():
+        return None
+
+    # Exact inputs are served from the persistent store without embedding them
+    store_key = content_key(
+        llm_request.model or "", _system_instruction_text(llm_request), text
+    )
+    response_store = get_response_store()
+    if response_store is not None:
+        stored_output = response_store.get(store_key)
+        if stored_output is not None:
+            return LlmResponse(
+                content=types.Content(
+                    role="model", parts=[types.Part(text=stored_output)]
+                )
+            )
+
+    embedding = (
+        await embedding_service.generate_embeddings(
+            [text], task_type="SEMANTIC_SIMILARITY"
+        )
+    )[0]
+    namespace = _cache_namespace(llm_request)
+
+    cached_output = claim_structuring_cache.get(namespace, text, embedding)
+    if cached_output is None:
+        _pending_cache_entries[callback_context.invocation_id] = (
+            namespace,
+            text,
+            embedding,
+            store_key,
+        )
+        # Failed model calls never reach the after-callback; drop their entries
+        while len(_pending_cache_entries) > MAX_PENDING_CACHE_ENTRIES:
+            _pending_cache_entries.pop(next(iter(_pending_cache_entries)))
+        return None
+
+    return LlmResponse(
+        content=types.Content(role="model", parts=[types.Part(text=cached_output)])
+    )
+
+
+def store_structured_claims_cache(
+    callback_context: CallbackContext, llm_response: LlmResponse
+) -> LlmResponse | None:
+    """Store a validated model response for the input embedded on cache miss."""
+    if llm_response.partial:
+        return None
+
+    pending = _pending_cache_entries.pop(callback_context.invocation_id, None)
+    if pending is None or not llm_response.content:
+        return None
+
+    output_text = "".join(
+        part.text or "" for part in llm_response.content.parts or [] if not part.thought
+    )
+    try:
+        StructuredClaimsOutput.model_validate_json(output_text)
+    except ValidationError:
+        logger.warning(
+            "store_structured_claims_cache: Response failed validation; not cached",
+            extra={"json_fields": {"invocation_id": callback_context.invocation_id}},
+        )
+        return None
+
+    namespace, text, embedding, store_key = pending
+    claim_structuring_cache.put(namespace, text, embedding, output_text)
+    response_store = get_response_store()
+    if response_store is not None:
+        response_store.set(store_key, output_text, settings.response_store_ttl_seconds)
+    return None
+
+
+async def structure_easy_input_with_fast_model(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> LlmResponse | None:
+    """Structure short inputs with a small Groq-hosted model when configured.
+
+    The result is used only if every claim meets the confidence floor;
+    otherwise the request continues to Gemini.
+    """
+    fast_model = settings.claim_structuring_fast_model
+    if not fast_model:
+        return None
+
+    text = _user_text(callback_context)
+    if not text.strip() or not is_easy_input(text):
+        return None
+
+    try:
+        response = await groq_client.chat.completions.create(
+            model=fast_model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": _system_instruction_text(llm_request)
+                    + _FAST_MODEL_INSTRUCTION_SUFFIX,
+                },
+                {"role": "user", "content": text},
+            ],
+            temperature=0.0,
+            response_format={"type": "json_object"},
+        )
+        output = StructuredClaimsOutput.model_validate_json(
+            response.choices[0].message.content or ""
+        )
+    except Exception:
+        logger.warning(
+            "structure_easy_input_with_fast_model: Fast model failed; using Gemini",
+            exc_info=True,
+            extra={"json_fields": {"model": fast_model}},
+        )
+        return None
+
+    min_confidence = min((claim.confidence for claim in output.claims), default=0.0)
+    if min_confidence < settings.claim_structuring_fast_min_confidence:
+        logger.info(
+            "structure_easy_input_with_fast_model: Low confidence; using Gemini",
+            extra={"json_fields": {"min_confidence": min_confidence}},
+        )
+        return None
+
+    llm_response = LlmResponse(
+        content=types.Content(
+            role="model", parts=[types.Part(text=output.model_dump_json())]
+        )
+    )
+    # A response returned from a before-callback skips the after-callbacks
+    store_structured_claims_cache(callback_context, llm_response)
+    return llm_response
+
+
+async def _structure_claims_batch(
+    namespace: str, items: list[tuple[str, LlmRequest]]
+) -> list[str | None]:
+    """Structure several documents in one model call.
+
+    Returns the StructuredClaimsOutput JSON per document; None sends that
+    document down the regular single-document path instead.
+    """
+    if len(items) == 1:
+        return [None]
+
+    first_request = items[0][1]
+    system_instruction = first_request.config.system_instruction
+    instruction_parts = (
+        list(system_instruction.parts or [])
+        if isinstance(system_instruction, types.Content)
+        else [types.Part(text=str(system_instruction or ""))]
+    )
+    config = first_request.config.model_copy(
+        update={
+            "system_instruction": types.Content(
+                role="system",
+                parts=[*instruction_parts, types.Part(text=_BATCH_INSTRUCTION_SUFFIX)],
+            ),
+            "response_schema": BatchedStructuredClaimsOutput,
+        }
+    )
+    documents = "\n".join(
+        f'<doc id="D{index}">\n{text}\n</doc>'
+        for index, (text, _) in enumerate(items, start=1)
+    )
+
+    try:
+        async with get_gemini_semaphore():
+            client = get_gemini_model(MODEL).api_client
+            response = await client.aio.models.generate_content(
+                model=first_request.model or MODEL,
+                contents=[
+                    types.Content(role="user", parts=[types.Part(text=documents)])
+                ],
+                config=config,
+            )
+        output = BatchedStructuredClaimsOutput.model_validate_json(response.text or "")
+    except Exception:
+        logger.warning(
+            "_structure_claims_batch: Batched call failed; structuring individually",
+            exc_info=True,
+            extra={"json_fields": {"namespace": namespace, "documents": len(items)}},
+        )
+        return [None] * len(items)
+
+    claims_by_document = {
+        document.id: StructuredClaimsOutput(claims=document.claims).model_dump_json()
+        for document in output.documents
+    }
+    logger.info(
+        "_structure_claims_batch: Structured batch",
+        extra={
+            "json_fields": {
+                "documents": len(items),
+                "returned_documents": len(claims_by_document),
+            }
+        },
+    )
+    return [claims_by_document.get(f"D{index}") for index in range(1, len(items) + 1)]
+
+
+claim_structuring_batcher: MicroBatcher[tuple[str, LlmRequest], str | None] = (
+    MicroBatcher(
+        _structure_claims_batch,
+        window_seconds=settings.claim_structuring_batch_window_ms / 1000,
+        max_batch_size=settings.claim_structuring_max_batch_size,
+    )
+)
 
-MODEL = settings.GEMINI_2_5_FLASH_MODEL
+
+async def batch_structured_claims_request(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> LlmResponse | None:
+    """Coalesce concurrent requests into one model call when batching is enabled."""
+    if settings.claim_structuring_batch_window_ms <= 0:
+        return None
+
+    text = _user_text(callback_context)
+    if not text.strip():
+        return None
+
+    output_text = await claim_structuring_batcher.submit(
+        _cache_namespace(llm_request), (text, llm_request)
+    )
+    if output_text is None:
+        return None
+
+    llm_response = LlmResponse(
+        content=types.Content(role="model", parts=[types.Part(text=output_text)])
+    )
+    # A response returned from a before-callback skips the after-callbacks
+    store_structured_claims_cache(callback_context, llm_response)
+    return llm_response
+
+
+route_thinking_budget, fall_back_to_thinking = create_adaptive_thinking_callbacks(
+    StructuredClaimsOutput,
+    lambda callback_context, _: is_easy_input(_user_text(callback_context)),
+)
 
 
 claim_structuring_agent = LlmAgent(
-    model=MODEL,
+    model=get_gemini_model(MODEL),
     name="ClaimStructuringAgent",
     generate_content_config=types.GenerateContentConfig(temperature=0.0, top_k=1),
-    before_model_callback=inject_current_date_before_model,
+    before_model_callback=[
+        inject_current_date_before_model,
+        lookup_structured_claims_cache,
+        structure_easy_input_with_fast_model,
+        batch_structured_claims_request,
+        route_thinking_budget,
+        use_cached_instruction_before_model,
+    ],
+    after_model_callback=[fall_back_to_thinking, store_structured_claims_cache],
     instruction="""
     You are given free-form text (articles, image descriptions, video summaries,
     etc.). Extract ONLY discrete, atomic, and externally verifiable claims. Each
@@ -105,14 +429,7 @@ claim_structuring_agent = LlmAgent(
 
     ## OUTPUT FORMAT
 
-    Strict JSON (no commentary, no extra fields):
-    {
-      "claims": [
-        {"id": "C1", "text": "<claim 1>", "confidence": 0.9},
-        {"id": "C2", "text": "<claim 2>", "confidence": 0.8}
-      ]
-    }
-
+    Strict JSON matching the response schema (no commentary, no extra fields):
     - IDs: "C1", "C2", "C3"... sequential in order of appearance
     - Maintain source text ordering
     - Keep claims in the source language (no translation)
@@ -139,25 +456,7 @@ claim_structuring_agent = LlmAgent(
     - "Many say it's revolutionary" → excluded (opinion without attribution)
     - "the company" → "OpenAI" (resolved reference)
 
-    ### Example 2: Company description
-    Input:
-    "Since 2021, Alice Kim has served as CTO of Acme Corp. Under her leadership,
-    the engineering team grew from 50 to 200 people. Revenue grew significantly."
-
-    Output:
-    {
-      "claims": [
-        {"id": "C1", "text": "Since 2021, Alice Kim has served as CTO of Acme Corp.", "confidence": 1.0},
-        {"id": "C2", "text": "Acme Corp's engineering team grew from 50 to 200 people since Alice Kim became CTO in 2021.", "confidence": 0.9}
-      ]
-    }
-
-    Rationale:
-    - C1: Kept as-is (self-contained with time anchor)
-    - C2: "her leadership" → "Alice Kim became CTO" (resolved + added context)
-    - "Revenue grew significantly" → excluded (no measurable qualifier)
-
-    ### Example 3: Image description
+    ### Example 2: Image description
     Input:
     "The image shows a protest in New York. Signs visible include 'Climate Action
     Now' and people are wearing green. Estimates suggest 10,000 attendees."
@@ -175,7 +474,7 @@ claim_structuring_agent = LlmAgent(
     - "Estimates suggest" → "estimated" (kept qualifier showing uncertainty)
     - "The image shows" → kept (grounds visual claims to source medium)
 
-    ### Example 4: Video summary with temporal info
+    ### Example 3: Video summary with temporal info
     Input:
     "In the video, the speaker claims that Cybertruck production started in
     November 2023. He mentions deliveries began the same month but were limited to
@@ -197,7 +496,7 @@ claim_structuring_agent = LlmAgent(
     - "the same month" → "November 2023" (resolved temporal reference)
     - "250K" → "250,000" (expanded abbreviation for clarity)
 
-    ### Example 5: Complex statement with attribution
+    ### Example 4: Complex statement with attribution
     Input:
     "The CEO announced Q4 2023 revenue of $500M, up 40% YoY. This makes them the
     fastest-growing company in the sector."
@@ -216,7 +515,7 @@ claim_structuring_agent = LlmAgent(
     - Split compound statement into two claims
     - "fastest-growing in sector" → excluded (superlative without clear measurement criteria)
 
-    ### Example 6: Under-specified + typo-prone input (RELAXED MODE)
+    ### Example 5: Under-specified + typo-prone input (RELAXED MODE)
     Input:
     "tallest building 500 meters long. and president ofgerogia is kavela"
 
@@ -3,24 +3,384 @@
 
 from __future__ import annotations
 
+import hashlib
+import logging
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from string import Template
+
+import orjson
+from cachetools import TTLCache
 from google.adk.agents import LlmAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.models import LlmRequest, LlmResponse
 from google.adk.planners import BuiltInPlanner
 from google.genai import types
-
-from wal_fact_checker.core.models import GapQuestionsOutput
+from pydantic import ValidationError
+
+from wal_fact_checker.core.llm import get_gemini_model
+from wal_fact_checker.core.models import (
+    AtomicClaimOutput,
+    GapQuestionOutput,
+    GapQuestionsOutput,
+    StructuredClaimsOutput,
+)
 from wal_fact_checker.core.settings import settings
-from wal_fact_checker.utils.callbacks import inject_current_date_before_model
+from wal_fact_checker.utils.callbacks import (
+    create_adaptive_thinking_callbacks,
+    inject_current_date_before_model,
+    use_cached_instruction_before_model,
+)
+from wal_fact_checker.utils.embedding_service import embedding_service
+from wal_fact_checker.utils.response_store import get_response_store
+from wal_fact_checker.utils.semantic_cache import SemanticCache
+from wal_fact_checker.utils.text import extract_numbers, normalize_claim
 
-MODEL = settings.GEMINI_2_5_FLASH_MODEL
+logger = logging.getLogger(__name__)
+
+MODEL = settings.GAP_IDENTIFICATION_MODEL
 MAX_GAP_QUESTIONS: int = 15
+# Small inputs get a proportionally smaller question cap and thinking budget
+QUESTIONS_PER_CLAIM: int = 3
+MIN_THINKING_BUDGET: int = 256
+MAX_THINKING_BUDGET: int = 2048
+THINKING_BUDGET_PER_CLAIM: int = 128
+# Bump whenever the instruction changes so cached questions are invalidated
+GAP_INSTRUCTION_VERSION: int = 2
+
+# Questions are cached per claim: the same atomic claim recurs across articles.
+# The TTL bounds how stale date-sensitive questions can get.
+GAP_CACHE_TTL_SECONDS = 24 * 60 * 60
+GAP_CACHE_MAX_ENTRIES = 10_000
+MAX_PENDING_CACHE_ENTRIES = 100
+# Requests with at most this many claims are answered without thinking
+EASY_CLAIM_COUNT = 2
+
+_PRIORITY_RANK = {"high": 0, "medium": 1, "low": 2}
+
+# Local prefilter: short past-event claims anchored by a year, with no other
+# figures and no status, scope or vagueness terms, only need their source
+# confirmed and get a templated question instead of a model call
+SELF_VERIFYING_MAX_CHARS = 160
+_YEAR_PATTERN = re.compile(r"(?:1[89]|20)\d\d")
+_NEEDS_ANALYSIS_PATTERN = re.compile(
+    r"\b(?:current(?:ly)?|still|since|now|today|as of|recent(?:ly)?|latest|"
+    r"supports?|includes?|significant(?:ly)?|major|many|most|best|largest|"
+    r"biggest|first|only|leading|according to|unspecified|aims?|plans?|will)\b",
+    re.IGNORECASE,
+)
 
+# claim key -> questions without id/claim_id, re-assigned on every merge
+gap_questions_cache: TTLCache[str, list[dict[str, str]]] = TTLCache(
+    maxsize=GAP_CACHE_MAX_ENTRIES, ttl=GAP_CACHE_TTL_SECONDS
+)
 
-gap_identification_agent = LlmAgent(
-    model=MODEL,
-    name="GapIdentificationAgent",
-    generate_content_config=types.GenerateContentConfig(temperature=0.0, top_k=1),
-    before_model_callback=inject_current_date_before_model,
-    instruction=f"""
+# Paraphrased claims reuse questions through a second, embedding-based tier.
+# Truncated embeddings keep the brute-force search small and fast.
+CLAIM_SEMANTIC_CACHE_THRESHOLD = 0.95
+CLAIM_SEMANTIC_CACHE_MAX_ENTRIES = 5000
+CLAIM_EMBEDDING_DIMENSIONS = 768
+_SEMANTIC_CACHE_NAMESPACE = f"{GAP_INSTRUCTION_VERSION}:{MAX_GAP_QUESTIONS}:{MODEL}"
+
+claim_semantic_cache = SemanticCache(
+    threshold=CLAIM_SEMANTIC_CACHE_THRESHOLD,
+    max_entries=CLAIM_SEMANTIC_CACHE_MAX_ENTRIES,
+    ttl_seconds=GAP_CACHE_TTL_SECONDS,
+)
+
+
+@dataclass
+class _PendingGapRequest:
+    claims: list[AtomicClaimOutput]
+    claim_keys: dict[str, str]
+    cached: dict[str, list[dict[str, str]]]
+    embeddings: dict[str, list[float]]
+
+
+# Claims split on cache lookup, kept until the model response is merged
+_pending_gap_requests: dict[str, _PendingGapRequest] = {}
+
+
+def _claim_cache_key(claim_text: str) -> str:
+    key_source = (
+        f"{GAP_INSTRUCTION_VERSION}:{MAX_GAP_QUESTIONS}:{MODEL}:"
+        f"{normalize_claim(claim_text)}"
+    )
+    return hashlib.sha256(key_source.encode()).hexdigest()
+
+
+def _get_cached_questions(key: str) -> list[dict[str, str]] | None:
+    """Look a claim up in memory, then in the persistent store if configured."""
+    questions = gap_questions_cache.get(key)
+    if questions is not None:
+        return questions
+
+    response_store = get_response_store()
+    stored = response_store.get(key) if response_store is not None else None
+    if stored is None:
+        return None
+    questions = orjson.loads(stored)
+    gap_questions_cache[key] = questions
+    return questions
+
+
+def _put_cached_questions(key: str, questions: list[dict[str, str]]) -> None:
+    gap_questions_cache[key] = questions
+    response_store = get_response_store()
+    if response_store is not None:
+        response_store.set(key, orjson.dumps(questions).decode(), GAP_CACHE_TTL_SECONDS)
+
+
+def _is_self_verifying(claim_text: str) -> bool:
+    """Return True for claims that need no more than a source confirmation."""
+    if len(claim_text) > SELF_VERIFYING_MAX_CHARS:
+        return False
+    numbers = extract_numbers(claim_text)
+    if not numbers or not all(_YEAR_PATTERN.fullmatch(n) for n in numbers):
+        return False
+    return _NEEDS_ANALYSIS_PATTERN.search(claim_text) is None
+
+
+def _templated_questions(claim_text: str) -> list[dict[str, str]]:
+    statement = claim_text.strip().rstrip(".")
+    if statement.split(" ", 1)[0] in {"The", "A", "An"}:
+        statement = statement[0].lower() + statement[1:]
+    return [
+        {
+            "question": f"What authoritative source confirms that {statement}?",
+            "question_type": "implicit",
+            "priority": "high",
+        }
+    ]
+
+
+def _effective_max_questions(claim_count: int) -> int:
+    if claim_count <= 0:
+        return MAX_GAP_QUESTIONS
+    return min(MAX_GAP_QUESTIONS, QUESTIONS_PER_CLAIM * claim_count)
+
+
+def _thinking_budget(claim_count: int) -> int:
+    budget = MIN_THINKING_BUDGET + THINKING_BUDGET_PER_CLAIM * claim_count
+    return max(MIN_THINKING_BUDGET, min(MAX_THINKING_BUDGET, budget))
+
+
+def _merge_gap_questions(
+    claims: list[AtomicClaimOutput], questions_by_claim: dict[str, list[dict[str, str]]]
+) -> str:
+    """Merge per-claim questions in claim order and renumber them Q1..Qn."""
+    merged = [
+        (claim.id, question)
+        for claim in claims
+        for question in questions_by_claim.get(claim.id, [])
+    ]
+    max_questions = _effective_max_questions(len(claims))
+    if len(merged) > max_questions:
+        kept = sorted(
+            range(len(merged)),
+            key=lambda i: _PRIORITY_RANK.get(merged[i][1].get("priority", ""), 3),
+        )[:max_questions]
+        merged = [merged[i] for i in sorted(kept)]
+
+    covered_claim_ids = {claim_id for claim_id, _ in merged}
+    uncovered_claim_ids = [
+        claim.id for claim in claims if claim.id not in covered_claim_ids
+    ]
+    if uncovered_claim_ids:
+        logger.warning(
+            "_merge_gap_questions: Claims left without questions",
+            extra={"json_fields": {"claim_ids": uncovered_claim_ids}},
+        )
+
+    output = GapQuestionsOutput(
+        gap_questions=[
+            GapQuestionOutput(id=f"Q{index}", claim_id=claim_id, **question)
+            for index, (claim_id, question) in enumerate(merged, start=1)
+        ]
+    )
+    return output.model_dump_json()
+
+
+def _structured_claims_from_state(
+    context: ReadonlyContext,
+) -> list[AtomicClaimOutput]:
+    raw_claims = context.state.get("structured_claims")
+    if not raw_claims:
+        return []
+
+    try:
+        if isinstance(raw_claims, str):
+            return StructuredClaimsOutput.model_validate_json(raw_claims).claims
+        return StructuredClaimsOutput.model_validate(raw_claims).claims
+    except ValidationError:
+        return []
+
+
+def _has_few_claims(callback_context: CallbackContext, llm_request: LlmRequest) -> bool:
+    return len(_structured_claims_from_state(callback_context)) <= EASY_CLAIM_COUNT
+
+
+def scale_thinking_budget_before_model(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> LlmResponse | None:
+    """Size the thinking budget to the number of claims to analyze."""
+    claim_count = len(_structured_claims_from_state(callback_context))
+    if claim_count and llm_request.config.thinking_config is not None:
+        llm_request.config.thinking_config = types.ThinkingConfig(
+            thinking_budget=_thinking_budget(claim_count)
+        )
+    return None
+
+
+route_thinking_budget, fall_back_to_thinking = create_adaptive_thinking_callbacks(
+    GapQuestionsOutput,
+    _has_few_claims,
+    escalation_model=settings.GEMINI_2_5_FLASH_MODEL,
+)
+
+
+async def lookup_gap_questions_cache(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> LlmResponse | None:
+    """Serve cached questions per claim and only send uncached claims to the model."""
+    claims = _structured_claims_from_state(callback_context)
+    if not claims:
+        return None
+
+    claim_keys = {claim.id: _claim_cache_key(claim.text) for claim in claims}
+    cached = {
+        claim_id: questions
+        for claim_id, key in claim_keys.items()
+        if (questions := _get_cached_questions(key)) is not None
+    }
+    if settings.gap_prefilter_enabled:
+        cached.update(
+            (claim.id, _templated_questions(claim.text))
+            for claim in claims
+            if claim.id not in cached and _is_self_verifying(claim.text)
+        )
+    uncached_claims = [claim for claim in claims if claim.id not in cached]
+
+    embeddings: dict[str, list[float]] = {}
+    semantic_hits = 0
+    if uncached_claims:
+        claim_embeddings = await embedding_service.generate_embeddings(
+            [claim.text for claim in uncached_claims],
+            task_type="SEMANTIC_SIMILARITY",
+            output_dimensionality=CLAIM_EMBEDDING_DIMENSIONS,
+        )
+        for claim, embedding in zip(uncached_claims, claim_embeddings, strict=True):
+            questions = claim_semantic_cache.get(
+                _SEMANTIC_CACHE_NAMESPACE, claim.text, embedding
+            )
+            if questions is not None:
+                cached[claim.id] = questions
+                semantic_hits += 1
+            else:
+                embeddings[claim.id] = embedding
+        uncached_claims = [claim for claim in claims if claim.id not in cached]
+
+    logger.info(
+        "lookup_gap_questions_cache: Split claims",
+        extra={
+            "json_fields": {
+                "cached_claims": len(cached),
+                "semantic_hits": semantic_hits,
+                "uncached_claims": len(uncached_claims),
+            }
+        },
+    )
+
+    if not uncached_claims:
+        return LlmResponse(
+            content=types.Content(
+                role="model",
+                parts=[types.Part(text=_merge_gap_questions(claims, cached))],
+            )
+        )
+
+    _pending_gap_requests[callback_context.invocation_id] = _PendingGapRequest(
+        claims=claims, claim_keys=claim_keys, cached=cached, embeddings=embeddings
+    )
+    # Failed model calls never reach the after-callback; drop their entries
+    while len(_pending_gap_requests) > MAX_PENDING_CACHE_ENTRIES:
+        _pending_gap_requests.pop(next(iter(_pending_gap_requests)))
+
+    if cached:
+        uncached_output = StructuredClaimsOutput(claims=uncached_claims)
+        llm_request.contents = [
+            types.Content(
+                role="user",
+                parts=[
+                    types.Part(
+                        text=f"Structured claims:\n{uncached_output.model_dump_json()}"
+                    )
+                ],
+            )
+        ]
+    return None
+
+
+def store_gap_questions_cache(
+    callback_context: CallbackContext, llm_response: LlmResponse
+) -> LlmResponse | None:
+    """Cache new questions per claim and merge them with the cached ones."""
+    if llm_response.partial:
+        return None
+
+    pending = _pending_gap_requests.pop(callback_context.invocation_id, None)
+    if pending is None or not llm_response.content:
+        return None
+
+    output_text = "".join(
+        part.text or "" for part in llm_response.content.parts or [] if not part.thought
+    )
+    try:
+        output = GapQuestionsOutput.model_validate_json(output_text)
+    except ValidationError:
+        logger.warning(
+            "store_gap_questions_cache: Response failed validation; not cached",
+            extra={"json_fields": {"invocation_id": callback_context.invocation_id}},
+        )
+        return None
+
+    questions_by_claim: dict[str, list[dict[str, str]]] = dict(pending.cached)
+    for question in output.gap_questions:
+        if question.claim_id in pending.claim_keys and (
+            question.claim_id not in pending.cached
+        ):
+            questions_by_claim.setdefault(question.claim_id, []).append(
+                question.model_dump(exclude={"id", "claim_id"})
+            )
+
+    for claim in pending.claims:
+        # Claims left without questions may have lost out to the question cap
+        if claim.id in pending.cached or claim.id not in questions_by_claim:
+            continue
+        questions = questions_by_claim[claim.id]
+        _put_cached_questions(pending.claim_keys[claim.id], questions)
+        if claim.id in pending.embeddings:
+            claim_semantic_cache.put(
+                _SEMANTIC_CACHE_NAMESPACE,
+                claim.text,
+                pending.embeddings[claim.id],
+                questions,
+            )
+
+    if not pending.cached:
+        return None
+
+    merged_text = _merge_gap_questions(pending.claims, questions_by_claim)
+    return llm_response.model_copy(
+        update={
+            "content": types.Content(role="model", parts=[types.Part(text=merged_text)])
+        }
+    )
+
+
+_GAP_IDENTIFICATION_INSTRUCTION_TEMPLATE = Template("""
     You are given structured claims extracted from source text. Generate critical
     research questions that, when answered, will provide sufficient evidence to
     verify or refute each claim. Each question will be independently researched
@@ -94,7 +454,7 @@ gap_identification_agent = LlmAgent(
 
     MINIMAL SUFFICIENT SET:
     - Generate the FEWEST questions needed to verify each claim
-    - Maximum {MAX_GAP_QUESTIONS} questions total across all claims
+    - Maximum $max_gap_questions questions total across all claims
     - Deduplicate: if claims overlap, consolidate questions
     - Prioritize questions that unlock verification for multiple claims
 
@@ -106,7 +466,7 @@ gap_identification_agent = LlmAgent(
       3. Time-sensitive validations (current status)
       4. Clarifications of ambiguous terms
 
-    PRIORITIZATION (if exceeding {MAX_GAP_QUESTIONS}):
+    PRIORITIZATION (if exceeding $max_gap_questions):
     - Keep questions that verify multiple claims
     - Keep questions for time-sensitive or controversial claims
     - Keep questions for quantifiable assertions over descriptive ones
@@ -127,19 +487,14 @@ gap_identification_agent = LlmAgent(
 
     ## OUTPUT FORMAT
 
-    Strict JSON (no commentary, no extra fields):
-    {{"gap_questions": [
-        {{"id": "Q1", "question": "<question?>", "claim_id": "C1", "question_type": "temporal", "priority": "high"}},
-        {{"id": "Q2", "question": "<question?>", "claim_id": "C2", "question_type": "quantifiable", "priority": "medium"}}
-      ]
-    }}
+    Strict JSON matching the response schema (no commentary, no extra fields).
 
     Requirements:
     - IDs: "Q1", "Q2", "Q3"... sequential across all claims
     - question_type must be one of: temporal, quantifiable, ambiguous, implicit
     - claim_id must match exactly the ID from the input claims
     - priority must be one of: high, medium, low
-    - Maximum {MAX_GAP_QUESTIONS} questions in the gap_questions array
+    - Maximum $max_gap_questions questions in the gap_questions array
     - Maintain claim order; within a claim, order by priority (high-impact first)
 
     ## EXAMPLES
@@ -148,8 +503,8 @@ gap_identification_agent = LlmAgent(
     Claim C1: "Since 2021, Alice Kim has served as CTO of Acme Corp."
 
     Questions:
-    {{"id": "Q1", "question": "Is Alice Kim currently serving as CTO of Acme Corp as of September 30, 2025?", "claim_id": "C1", "question_type": "temporal", "priority": "high"}}
-    {{"id": "Q2", "question": "When did Alice Kim become CTO of Acme Corp according to official company announcements?", "claim_id": "C1", "question_type": "implicit", "priority": "medium"}}
+    {"id": "Q1", "question": "Is Alice Kim currently serving as CTO of Acme Corp as of September 30, 2025?", "claim_id": "C1", "question_type": "temporal", "priority": "high"}
+    {"id": "Q2", "question": "When did Alice Kim become CTO of Acme Corp according to official company announcements?", "claim_id": "C1", "question_type": "implicit", "priority": "medium"}
 
     Rationale:
     - Q1 validates current status (temporal)
@@ -160,8 +515,8 @@ gap_identification_agent = LlmAgent(
     Claim C2: "GPT-4 supports image inputs."
 
     Questions:
-    {{"id": "Q3", "question": "What types of image inputs and formats does GPT-4 support according to OpenAI's official documentation?", "claim_id": "C2", "question_type": "ambiguous", "priority": "high"}}
-    {{"id": "Q4", "question": "What official OpenAI announcement or documentation confirms GPT-4's image input capability?", "claim_id": "C2", "question_type": "implicit", "priority": "medium"}}
+    {"id": "Q3", "question": "What types of image inputs and formats does GPT-4 support according to OpenAI's official documentation?", "claim_id": "C2", "question_type": "ambiguous", "priority": "high"}
+    {"id": "Q4", "question": "What official OpenAI announcement or documentation confirms GPT-4's image input capability?", "claim_id": "C2", "question_type": "implicit", "priority": "medium"}
 
     Rationale:
     - Q3 clarifies what "supports" means (ambiguous)
@@ -172,50 +527,67 @@ gap_identification_agent = LlmAgent(
     Claim C3: "Acme Corp's engineering team grew from 50 to 200 people since Alice Kim became CTO in 2021."
 
     Questions:
-    {{"id": "Q5", "question": "What was the exact size of Acme Corp's engineering team when Alice Kim became CTO in 2021?", "claim_id": "C3", "question_type": "quantifiable", "priority": "high"}}
-    {{"id": "Q6", "question": "What is the current size of Acme Corp's engineering team as of September 30, 2025?", "claim_id": "C3", "question_type": "quantifiable", "priority": "high"}}
+    {"id": "Q5", "question": "What was the exact size of Acme Corp's engineering team when Alice Kim became CTO in 2021?", "claim_id": "C3", "question_type": "quantifiable", "priority": "high"}
+    {"id": "Q6", "question": "What is the current size of Acme Corp's engineering team as of September 30, 2025?", "claim_id": "C3", "question_type": "quantifiable", "priority": "high"}
 
     Rationale:
     - Q5 verifies the starting number (quantifiable)
     - Q6 verifies the ending number with time anchor (quantifiable)
     - Both needed to verify the growth claim
 
-    ### Example 4: Event claim requiring existence verification
-    Claim C4: "OpenAI released GPT-4 in March 2023."
-
-    Questions:
-    {{"id": "Q7", "question": "When did OpenAI officially release GPT-4 according to OpenAI's announcements?", "claim_id": "C4", "question_type": "implicit", "priority": "high"}}
-
-    Rationale:
-    - Single question sufficient - verifies date and event
-    - Asks for official source (implicit prerequisite)
-    - Straightforward factual claim needs simple verification
-
-    ### Example 5: Attributed claim from video requiring source validation
-    Claim C5: "According to the video speaker, Tesla Cybertruck production started in November 2023."
+    ### Example 4: Attributed claim from video requiring source validation
+    Claim C4: "According to the video speaker, Tesla Cybertruck production started in November 2023."
 
     Questions:
-    {{"id": "Q8", "question": "When did Tesla officially begin Cybertruck production according to Tesla's official announcements or SEC filings?", "claim_id": "C5", "question_type": "implicit", "priority": "high"}}
+    {"id": "Q7", "question": "When did Tesla officially begin Cybertruck production according to Tesla's official announcements or SEC filings?", "claim_id": "C4", "question_type": "implicit", "priority": "high"}
 
     Rationale:
     - Claim is attributed to speaker, so verify against official sources
     - Don't verify what the speaker said - verify if what they said is TRUE
     - Single question targets the core factual assertion
 
-    ### Example 6: Multiple claims with overlapping verification needs
-    Claim C6: "Tesla Cybertruck production started in November 2023."
-    Claim C7: "Tesla Cybertruck deliveries began in November 2023 and were limited to employees."
+    ### Example 5: Multiple claims with overlapping verification needs
+    Claim C5: "Tesla Cybertruck production started in November 2023."
+    Claim C6: "Tesla Cybertruck deliveries began in November 2023 and were limited to employees."
 
     Questions:
-    {{"id": "Q9", "question": "When did Tesla officially begin Cybertruck production according to company announcements?", "claim_id": "C6", "question_type": "implicit", "priority": "high"}}
-    {{"id": "Q10", "question": "When did Tesla begin Cybertruck deliveries and who were the initial recipients according to official sources?", "claim_id": "C7", "question_type": "implicit", "priority": "high"}}
+    {"id": "Q8", "question": "When did Tesla officially begin Cybertruck production according to company announcements?", "claim_id": "C5", "question_type": "implicit", "priority": "high"}
+    {"id": "Q9", "question": "When did Tesla begin Cybertruck deliveries and who were the initial recipients according to official sources?", "claim_id": "C6", "question_type": "implicit", "priority": "high"}
 
     Rationale:
-    - Q9 verifies C6 (production start)
-    - Q10 verifies C7 (delivery start + initial recipients)
+    - Q8 verifies C5 (production start)
+    - Q9 verifies C6 (delivery start + initial recipients)
     - Both claims about same product but different events - need separate questions
     - Each question targets specific factual elements
-    """,
+    """)
+
+
+@lru_cache(maxsize=MAX_GAP_QUESTIONS + 1)
+def _render_gap_instruction(max_gap_questions: int) -> str:
+    return _GAP_IDENTIFICATION_INSTRUCTION_TEMPLATE.substitute(
+        max_gap_questions=max_gap_questions
+    )
+
+
+def gap_identification_instruction(context: ReadonlyContext) -> str:
+    """Render the instruction with a question cap scaled to the claim count."""
+    claim_count = len(_structured_claims_from_state(context))
+    return _render_gap_instruction(_effective_max_questions(claim_count))
+
+
+gap_identification_agent = LlmAgent(
+    model=get_gemini_model(MODEL),
+    name="GapIdentificationAgent",
+    generate_content_config=types.GenerateContentConfig(temperature=0.0, top_k=1),
+    before_model_callback=[
+        inject_current_date_before_model,
+        lookup_gap_questions_cache,
+        scale_thinking_budget_before_model,
+        route_thinking_budget,
+        use_cached_instruction_before_model,
+    ],
+    after_model_callback=[fall_back_to_thinking, store_gap_questions_cache],
+    instruction=gap_identification_instruction,
     description="Identifies critical gaps and potential weaknesses in claims",
     planner=BuiltInPlanner(
         thinking_config=types.ThinkingConfig(
@@ -5,6 +5,8 @@ from __future__ import annotations
 
 from google.adk.agents import SequentialAgent
 
+from wal_fact_checker.utils.callbacks import freeze_pipeline_date_before_agent
+
 from .analysis import claim_structuring_agent, gap_identification_agent
 from .research import research_orchestrator_agent
 from .synthesis import evidence_adjudicator_agent, report_transformation_agent
@@ -39,4 +41,5 @@ fact_check_orchestrator = SequentialAgent(
     name="FactCheckOrchestrator",
     sub_agents=[analysis_stage, research_stage, synthesis_stage],
     description="WAL Proactive Gap Analysis & Adversarial Critique Fact Checker",
+    before_agent_callback=freeze_pipeline_date_before_agent,
 )
@@ -3,61 +3,280 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from collections.abc import AsyncGenerator
-from typing import Final
+from typing import Any, Final
 
-from google.adk.agents import BaseAgent, ParallelAgent, SequentialAgent
+import orjson
+from cachetools import TTLCache
+from google.adk.agents import BaseAgent
 from google.adk.agents.invocation_context import InvocationContext
 from google.adk.events import Event, EventActions
 
+from wal_fact_checker.core.llm import gemini_quota_concurrency
 from wal_fact_checker.core.models import GapQuestionOutput, GapQuestionsOutput
 from wal_fact_checker.core.settings import settings
+from wal_fact_checker.utils.callbacks import PIPELINE_DATE_STATE_KEY
+from wal_fact_checker.utils.embedding_service import embedding_service
+from wal_fact_checker.utils.response_store import content_key, get_response_store
+from wal_fact_checker.utils.semantic_cache import SemanticCache
+from wal_fact_checker.utils.text import normalize_claim
 
 from .single_question_research_agent import (
+    can_batch_questions,
+    create_batched_research_agent,
     create_single_question_research_agent,
+    research_model_name,
 )
 
 # Configure logging for this module
 logger = logging.getLogger(__name__)
 
-MODEL: Final[str] = settings.GEMINI_2_5_FLASH_MODEL
+MAX_CONCURRENT_RESEARCH_AGENTS: Final[int] = 8
 
+# Per-question answers are temp-scoped: they live in the in-memory session for
+# this invocation only, and just the aggregated research_answers is persisted
+RESEARCH_ANSWER_KEY_PREFIX: Final[str] = "temp:research_answer_"
 
-class ResearchOrchestratorAgent(BaseAgent):
-    """Run SingleQuestionResearchAgent in parallel for each gap question."""
 
-    def __init__(self) -> None:
-        super().__init__(name="ResearchOrchestratorAgent")
-        logger.debug(f"Initialized {self.name}")
+def _research_concurrency() -> int:
+    """Size the worker pool so in-flight requests stay within the Gemini quota.
 
-    def _create_batch_parallel_agents(
-        self, questions: list[GapQuestionOutput], batch_size: int
-    ) -> list[ParallelAgent]:
-        """Create ParallelAgent instances for batched question processing."""
-        question_batches = [
-            questions[i : i + batch_size] for i in range(0, len(questions), batch_size)
-        ]
+    MAX_CONCURRENT_RESEARCH_AGENTS keeps a per-document ceiling for very large
+    quotas; the process-wide Gemini gate covers concurrent documents.
+    """
+    return min(MAX_CONCURRENT_RESEARCH_AGENTS, gemini_quota_concurrency())
 
-        batch_parallel_agents: list[ParallelAgent] = []
 
-        for batch_idx, batch_questions in enumerate(question_batches):
-            batch_worker_agents = [
-                create_single_question_research_agent(
-                    question=question.question,
-                    output_key=f"research_answer_{batch_idx * batch_size + q_idx}",
-                    priority=question.priority,
-                )
-                for q_idx, question in enumerate(batch_questions)
-            ]
+_PRIORITY_RANK: Final[dict[str, int]] = {"high": 0, "medium": 1, "low": 2}
+
+RESEARCH_CACHE_MAX_ENTRIES: Final[int] = 2000
+
+# Question key -> ResearchAnswerOutput dict, as the research agents write it
+research_answer_cache: TTLCache[str, dict[str, Any]] = TTLCache(
+    maxsize=RESEARCH_CACHE_MAX_ENTRIES,
+    ttl=max(settings.research_cache_ttl_seconds, 1),
+)
+
+# Paraphrased questions reuse answers through a second, embedding-based tier
+QUESTION_SEMANTIC_CACHE_THRESHOLD: Final[float] = 0.95
+QUESTION_EMBEDDING_DIMENSIONS: Final[int] = 768
+
+research_semantic_cache = SemanticCache(
+    threshold=QUESTION_SEMANTIC_CACHE_THRESHOLD,
+    max_entries=RESEARCH_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.research_cache_ttl_seconds,
+)
+
 
-            batch_parallel_agent = ParallelAgent(
-                name=f"SingleBatchBatchResearchAgent_{batch_idx}",
-                sub_agents=batch_worker_agents,
+# Every cache tier is keyed on the model that produced the answer, so answers
+# from the low-priority model are never served to higher-priority questions
+def _research_cache_key(question: str, model: str) -> str:
+    return content_key("research_answer_output", model, normalize_claim(question))
+
+
+def _get_cached_answer(question: str, model: str) -> dict[str, Any] | None:
+    """Look an answer up in memory, then in the persistent store if configured."""
+    if settings.research_cache_ttl_seconds <= 0:
+        return None
+    key = _research_cache_key(question, model)
+    answer = research_answer_cache.get(key)
+    if answer is not None:
+        return answer
+
+    response_store = get_response_store()
+    stored = response_store.get(key) if response_store is not None else None
+    if stored is None:
+        return None
+    answer = orjson.loads(stored)
+    research_answer_cache[key] = answer
+    return answer
+
+
+def _put_cached_answer(question: str, model: str, answer: dict[str, Any]) -> None:
+    if settings.research_cache_ttl_seconds <= 0:
+        return
+    key = _research_cache_key(question, model)
+    research_answer_cache[key] = answer
+    response_store = get_response_store()
+    if response_store is not None:
+        response_store.set(
+            key, orjson.dumps(answer).decode(), settings.research_cache_ttl_seconds
+        )
+
+
+def _deduplicate_questions(
+    questions: list[GapQuestionOutput],
+) -> list[GapQuestionOutput]:
+    """Drop questions that repeat an earlier one after normalization.
+
+    Different claims often yield the same check (e.g. "When was X founded?"),
+    and the adjudicator matches answers to claims itself, so one answer is
+    enough. The kept question takes the highest priority among its copies.
+    """
+    unique: dict[str, GapQuestionOutput] = {}
+    for question in questions:
+        key = normalize_claim(question.question)
+        kept = unique.get(key)
+        if kept is None:
+            unique[key] = question
+        elif _PRIORITY_RANK.get(question.priority, 2) < _PRIORITY_RANK.get(
+            kept.priority, 2
+        ):
+            unique[key] = kept.model_copy(update={"priority": question.priority})
+
+    if len(unique) < len(questions):
+        logger.info(
+            "Deduplicated gap questions before research",
+            extra={
+                "json_fields": {
+                    "questions": len(questions),
+                    "unique_questions": len(unique),
+                }
+            },
+        )
+    return list(unique.values())
+
+
+def _create_workers(
+    questions: list[str],
+    output_keys: list[str],
+    priority: str,
+    pipeline_date: str | None,
+) -> list[BaseAgent]:
+    """Build the research workers for questions sharing one priority.
+
+    Short questions are packed `research_batch_size` to a worker; otherwise
+    every question gets its own worker writing to its own output key.
+    """
+    batch_size = settings.research_batch_size
+    if batch_size > 1 and can_batch_questions(questions):
+        return [
+            create_batched_research_agent(
+                questions=questions[start : start + batch_size],
+                output_keys=output_keys[start : start + batch_size],
+                priority=priority,
+                pipeline_date=pipeline_date,
             )
-            batch_parallel_agents.append(batch_parallel_agent)
+            for start in range(0, len(questions), batch_size)
+        ]
+    return [
+        create_single_question_research_agent(
+            question=question,
+            output_key=output_key,
+            priority=priority,
+            pipeline_date=pipeline_date,
+        )
+        for question, output_key in zip(questions, output_keys, strict=True)
+    ]
+
+
+def _create_branch_context(
+    ctx: InvocationContext, parent: BaseAgent, worker: BaseAgent
+) -> InvocationContext:
+    """Give each worker an isolated branch so histories don't interleave."""
+    branch_ctx = ctx.model_copy()
+    branch_suffix = f"{parent.name}.{worker.name}"
+    branch_ctx.branch = f"{ctx.branch}.{branch_suffix}" if ctx.branch else branch_suffix
+    return branch_ctx
+
+
+async def _run_concurrently(
+    agent_runs: list[tuple[int, AsyncGenerator[Event, None]]],
+    concurrency: int,
+    timeout_seconds: float | None = None,
+    worker_timeout_seconds: float | None = None,
+) -> AsyncGenerator[Event, None]:
+    """Drive agent runs on a worker pool and merge their events into one stream.
+
+    Runs wait in a priority queue keyed by their rank (lower first) and
+    `concurrency` pool workers pull the most urgent run whenever they free
+    up, so the pool stays saturated while lower ranks only start once no
+    higher-ranked run is waiting. A run waits until its previous event has
+    been consumed so the runner persists state deltas in order. A run is
+    cancelled after `worker_timeout_seconds`, and everything still going
+    after `timeout_seconds` is cancelled; events already emitted stand.
+    """
+    pending: asyncio.PriorityQueue[tuple[int, int, AsyncGenerator[Event, None]]] = (
+        asyncio.PriorityQueue()
+    )
+    for index, (rank, agent_run) in enumerate(agent_runs):
+        pending.put_nowait((rank, index, agent_run))
+    queue: asyncio.Queue[tuple[Event | None, asyncio.Event | None]] = asyncio.Queue()
+
+    async def forward_events(agent_run: AsyncGenerator[Event, None]) -> None:
+        async for event in agent_run:
+            consumed = asyncio.Event()
+            await queue.put((event, consumed))
+            await consumed.wait()
+
+    async def work() -> None:
+        try:
+            while not pending.empty():
+                _, _, agent_run = pending.get_nowait()
+                try:
+                    await asyncio.wait_for(
+                        forward_events(agent_run),
+                        timeout=worker_timeout_seconds or None,
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning(
+                        "Research worker timed out; continuing without its answer",
+                        extra={
+                            "json_fields": {
+                                "worker_timeout_seconds": worker_timeout_seconds
+                            }
+                        },
+                    )
+        finally:
+            await queue.put((None, None))
+
+    tasks = [
+        asyncio.create_task(work())
+        for _ in range(min(max(concurrency, 1), len(agent_runs)))
+    ]
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout_seconds if timeout_seconds else None
+    try:
+        finished = 0
+        while finished < len(tasks):
+            try:
+                event, consumed = await asyncio.wait_for(
+                    queue.get(),
+                    timeout=None if deadline is None else deadline - loop.time(),
+                )
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "Research deadline reached; cancelling unfinished workers",
+                    extra={
+                        "json_fields": {
+                            "timeout_seconds": timeout_seconds,
+                            "busy_pool_workers": len(tasks) - finished,
+                            "queued_runs": pending.qsize(),
+                        }
+                    },
+                )
+                return
+            if event is None or consumed is None:
+                finished += 1
+                continue
+            yield event
+            consumed.set()
+        # Surface worker failures the same way ParallelAgent does
+        for task in tasks:
+            task.result()
+    finally:
+        for task in tasks:
+            task.cancel()
 
-        return batch_parallel_agents
+
+class ResearchOrchestratorAgent(BaseAgent):
+    """Run SingleQuestionResearchAgent in parallel for each gap question."""
+
+    def __init__(self) -> None:
+        super().__init__(name="ResearchOrchestratorAgent")
+        logger.debug(f"Initialized {self.name}")
 
     async def _run_async_impl(
         self, ctx: InvocationContext
@@ -70,7 +289,7 @@ class ResearchOrchestratorAgent(BaseAgent):
             return
 
         gap_questions_output = GapQuestionsOutput(**gap_questions_output_dict)
-        questions = gap_questions_output.gap_questions
+        questions = _deduplicate_questions(gap_questions_output.gap_questions)
 
         if not questions:
             logger.error(
@@ -78,73 +297,135 @@ class ResearchOrchestratorAgent(BaseAgent):
             )
             return
 
-        # Group questions by priority
-        priority_groups: dict[str, list[GapQuestionOutput]] = {
-            "high": [],
-            "medium": [],
-            "low": [],
-        }
-        for question in questions:
-            priority_groups[question.priority].append(question)
-
-        # Create a sequential workflow to execute priority groups in order
-        priority_workflow_agents = []
-        for priority in ["high", "medium", "low"]:
-            priority_questions = priority_groups[priority]
-            if not priority_questions:
-                continue
-
-            batch_size = 5
-            batch_parallel_agents = self._create_batch_parallel_agents(
-                priority_questions, batch_size
+        # One stable sort puts questions in dispatch order; a question's
+        # position is also the index of its answer key
+        questions.sort(
+            key=lambda question: _PRIORITY_RANK.get(
+                question.priority, len(_PRIORITY_RANK)
             )
+        )
+        output_keys = [
+            f"{RESEARCH_ANSWER_KEY_PREFIX}{i}" for i in range(len(questions))
+        ]
 
-            if not batch_parallel_agents:
+        # Cached answers are written directly; the rest are grouped by
+        # priority, in dispatch order, for the workers
+        cached_answers: dict[str, dict[str, Any]] = {}
+        misses: list[tuple[GapQuestionOutput, str]] = []
+        for question, output_key in zip(questions, output_keys, strict=True):
+            answer = _get_cached_answer(
+                question.question, research_model_name(question.priority)
+            )
+            if answer is not None:
+                cached_answers[output_key] = answer
+            else:
+                misses.append((question, output_key))
+
+        # Exact misses are embedded in one call and matched against answers
+        # to recently researched paraphrases
+        question_embeddings: dict[str, list[float]] = {}
+        if misses and settings.research_cache_ttl_seconds > 0:
+            embeddings = await embedding_service.generate_embeddings(
+                [question.question for question, _ in misses],
+                task_type="SEMANTIC_SIMILARITY",
+                output_dimensionality=QUESTION_EMBEDDING_DIMENSIONS,
+            )
+            for (question, output_key), embedding in zip(
+                misses, embeddings, strict=True
+            ):
+                answer = research_semantic_cache.get(
+                    research_model_name(question.priority),
+                    question.question,
+                    embedding,
+                )
+                if answer is not None:
+                    cached_answers[output_key] = answer
+                else:
+                    question_embeddings[output_key] = embedding
+
+        # Output key -> (question, model researching it)
+        researched_questions: dict[str, tuple[str, str]] = {}
+        pending: dict[str, tuple[list[str], list[str]]] = {}
+        for question, output_key in misses:
+            if output_key in cached_answers:
                 continue
-
-            priority_agent = SequentialAgent(
-                name=f"{priority.capitalize()}PriorityResearchAgent",
-                sub_agents=batch_parallel_agents,
+            pending_questions, pending_keys = pending.setdefault(
+                question.priority, ([], [])
+            )
+            pending_questions.append(question.question)
+            pending_keys.append(output_key)
+            researched_questions[output_key] = (
+                question.question,
+                research_model_name(question.priority),
             )
-            priority_workflow_agents.append(priority_agent)
 
-        if not priority_workflow_agents:
-            logger.warning(
-                f"[{ctx.invocation_id}] {self.name}: No priority agents created"
+        # Every priority group goes into one queue; the pool drains it in
+        # priority order without idling while lower-priority work is waiting
+        # Workers share the run's frozen date, so all of them render the same
+        # instruction prefix and agree with the other agents on "today"
+        pipeline_date = ctx.session.state.get(PIPELINE_DATE_STATE_KEY)
+        agent_runs: list[tuple[int, AsyncGenerator[Event, None]]] = []
+        for priority, (pending_questions, pending_keys) in pending.items():
+            rank = _PRIORITY_RANK.get(priority, len(_PRIORITY_RANK))
+            workers = _create_workers(
+                pending_questions, pending_keys, priority, pipeline_date
+            )
+            agent_runs.extend(
+                (rank, worker.run_async(_create_branch_context(ctx, self, worker)))
+                for worker in workers
             )
-            return
 
-        sequential_workflow = SequentialAgent(
-            name="PrioritySequentialResearchAgent",
-            sub_agents=priority_workflow_agents,
-        )
+        # Answers are collected from the event stream as workers finish, so no
+        # session state has to be read back per question afterwards
+        answer_indices = {output_key: i for i, output_key in enumerate(output_keys)}
+        answers: list[dict[str, Any] | None] = [None] * len(output_keys)
+        for output_key, answer in cached_answers.items():
+            answers[answer_indices[output_key]] = answer
 
-        self.sub_agents.append(sequential_workflow)
+        if cached_answers:
+            logger.info(
+                f"[{ctx.invocation_id}] {self.name}: Reused {len(cached_answers)} cached research answers"
+            )
+            yield Event(
+                invocation_id=ctx.invocation_id,
+                author=self.name,
+                actions=EventActions(state_delta=cached_answers),
+            )
 
-        # Execute the sequential workflow and yield its events
-        async for event in sequential_workflow.run_async(ctx):
+        async for event in _run_concurrently(
+            agent_runs,
+            _research_concurrency(),
+            settings.research_timeout_seconds,
+            settings.research_question_timeout_seconds,
+        ):
+            # Read the delta before yielding: the runner strips temp keys
+            for key, value in (event.actions.state_delta or {}).items():
+                index = answer_indices.get(key)
+                if index is not None:
+                    answers[index] = value
             yield event
 
-        research_answers: list[dict] = []
-        all_questions = (
-            priority_groups["high"] + priority_groups["medium"] + priority_groups["low"]
-        )
-        for i, _question in enumerate(all_questions):
-            output_key = f"research_answer_{i}"
-            research_answer = ctx.session.state.get(output_key)
-            if research_answer is None:
+        for output_key, (question_text, model) in researched_questions.items():
+            answer = answers[answer_indices[output_key]]
+            if not isinstance(answer, dict) or not answer:
+                continue
+            _put_cached_answer(question_text, model, answer)
+            if output_key in question_embeddings:
+                research_semantic_cache.put(
+                    model, question_text, question_embeddings[output_key], answer
+                )
+
+        for i, answer in enumerate(answers):
+            if answer is None:
                 logger.warning(
-                    f"[{ctx.invocation_id}] {self.name}: No answer found for key '{output_key}' (question {i})"
+                    f"[{ctx.invocation_id}] {self.name}: No answer found for key '{output_keys[i]}' (question {i})"
                 )
-                continue
-            research_answers.append(research_answer)
+        research_answers = [answer for answer in answers if answer is not None]
 
         logger.info(
             f"[{ctx.invocation_id}] {self.name}: Retrieved {len(research_answers)} research answers"
         )
 
-        ctx.session.state["research_answers"] = research_answers
-
         state_update_event = Event(
             invocation_id=ctx.invocation_id,
             author=self.name,
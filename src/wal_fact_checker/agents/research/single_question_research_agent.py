@@ -3,33 +3,124 @@
 
 from __future__ import annotations
 
+import asyncio
 import inspect
 import logging
 from collections.abc import Awaitable, Callable
-from datetime import datetime
+from datetime import date, datetime
+from functools import lru_cache
 from typing import Any
+from urllib.parse import urlsplit
 
 import numpy as np
 from google.adk.agents import LlmAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import Gemini
 from google.adk.tools import BaseTool, ToolContext
 from numpy._typing import NDArray
-from sklearn.metrics.pairwise import cosine_similarity
 
+from wal_fact_checker.core.llm import get_gemini_model
+from wal_fact_checker.core.models import BatchedResearchOutput, ResearchAnswerOutput
 from wal_fact_checker.core.settings import settings
 from wal_fact_checker.core.tools import groq_search_tool, scrape_websites_tool
-from wal_fact_checker.utils.embedding_service import embedding_service
+from wal_fact_checker.utils.embedding_service import (
+    EmbeddingTaskType,
+    embedding_service,
+)
 
 logger = logging.getLogger(__name__)
 
 MAX_NUMBER_OF_SEARCH_TOOL_CALLS = 2
 MAX_NUMBER_OF_SCRAPE_TOOL_CALLS = 1
 COSINE_SIMILARITY_THRESHOLD = 0.85  # Threshold for considering queries as duplicates
+# Only the most recent queries are checked for duplicates
+MAX_REMEMBERED_QUERY_EMBEDDINGS = 32
 
 tool_max_calls: dict[str, int] = {
     "search_tool": MAX_NUMBER_OF_SEARCH_TOOL_CALLS,
     "scrape_tool": MAX_NUMBER_OF_SCRAPE_TOOL_CALLS,
 }
 
+# Priority-based tool call limits for a single research question
+PRIORITY_TOOL_LIMITS: dict[str, dict[str, int]] = {
+    "high": {"search_tool": 4, "scrape_tool": 2},
+    "medium": {"search_tool": 2, "scrape_tool": 1},
+    "low": {"search_tool": 1, "scrape_tool": 0},
+}
+
+# Low-priority questions get a single search and no scraping, which the
+# smaller model handles as well as the default one at lower latency
+PRIORITY_MODELS: dict[str, str] = {
+    "low": settings.RESEARCH_LOW_PRIORITY_MODEL,
+}
+
+# Questions longer than this are always researched on their own
+MAX_BATCHED_QUESTION_LENGTH = 400
+
+# Once search snippets total this many characters, scraping is skipped
+SNIPPET_CHARS_SKIP_SCRAPE_THRESHOLD = 3000
+
+# Each scraped page reaches the model as at most this many of its most
+# query-relevant chunks, so long pages cannot flood the research context
+MAX_CHUNKS_PER_SCRAPED_URL = 3
+
+# scrape_tool URLs are trimmed to this many pages that can yield readable text
+MAX_URLS_PER_SCRAPE = 5
+NON_TEXT_URL_EXTENSIONS: tuple[str, ...] = (
+    ".zip",
+    ".mp4",
+    ".mp3",
+    ".mov",
+    ".jpg",
+    ".jpeg",
+    ".png",
+    ".gif",
+    ".pdf",
+)
+
+
+def _normalize_rows(matrix: NDArray[np.float32]) -> NDArray[np.float32]:
+    """Scale each row to unit length; zero rows (failed embeddings) stay zero.
+
+    Embeddings are normalized once when they arrive, so every cosine
+    similarity afterwards is a plain dot product.
+    """
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def _embedding_matrix(embeddings: list[list[float]]) -> NDArray[np.float32]:
+    """Build the normalized float32 matrix for a list of embeddings."""
+    if not embeddings:
+        return np.empty((0, 0), dtype=np.float32)
+    return _normalize_rows(np.asarray(embeddings, dtype=np.float32))
+
+
+async def _generate_embeddings_cached(
+    cache: dict[str, Any], texts: list[str], task_type: EmbeddingTaskType
+) -> list[list[float]]:
+    """Embed `texts`, reusing vectors this agent already fetched for `task_type`.
+
+    Failed embeddings come back as zero vectors and are not cached.
+    """
+    embeddings: dict[tuple[str, str], list[float]] = cache.setdefault("embeddings", {})
+    missing = list(dict.fromkeys(t for t in texts if (t, task_type) not in embeddings))
+    fetched: dict[str, list[float]] = {}
+    if missing:
+        fetched = dict(
+            zip(
+                missing,
+                await embedding_service.generate_embeddings(
+                    missing, task_type=task_type
+                ),
+                strict=True,
+            )
+        )
+        for text, embedding in fetched.items():
+            if any(embedding):
+                embeddings[(text, task_type)] = embedding
+    return [embeddings.get((text, task_type)) or fetched[text] for text in texts]
+
 
 def create_enforce_query_deduplication_callback(
     cache: dict[str, Any],
@@ -52,45 +143,47 @@ def create_enforce_query_deduplication_callback(
 
         try:
             embedding = (
-                await embedding_service.generate_embeddings(
-                    [query], task_type="SEMANTIC_SIMILARITY"
-                )
+                await _generate_embeddings_cached(cache, [query], "SEMANTIC_SIMILARITY")
             )[0]
 
             queries_key = f"{tool.name}_queries_embeddings"
 
-            previous_embeddings: list[NDArray] = cache.get(queries_key, [])
-
-            if not previous_embeddings:
-                cache[queries_key] = [embedding]
-                return None
-
-            previous_embeddings_matrix = np.array(previous_embeddings)
-            current_embedding_matrix = np.array([embedding])
-
-            similarity_matrix = cosine_similarity(
-                current_embedding_matrix, previous_embeddings_matrix
+            # Earlier query embeddings are kept as one normalized float32
+            # matrix, so no call has to rebuild it from a list of vectors
+            current_embedding_matrix = _normalize_rows(
+                np.asarray([embedding], dtype=np.float32)
+            )
+            previous_embeddings_matrix: NDArray[np.float32] | None = cache.get(
+                queries_key
             )
 
-            is_duplicate = False
+            if previous_embeddings_matrix is None:
+                cache[queries_key] = current_embedding_matrix
+                return None
 
-            for i in range(len(current_embedding_matrix)):
-                for j in range(len(previous_embeddings_matrix)):
-                    similarity = similarity_matrix[i, j]
+            similarity_matrix = current_embedding_matrix @ previous_embeddings_matrix.T
 
-                    logger.info(
-                        "enforce_query_deduplication: Similarity between queries",
-                        extra={
-                            "json_fields": {"similarity": similarity},
-                        },
-                    )
+            max_similarity = float(similarity_matrix.max())
+            is_duplicate = max_similarity >= COSINE_SIMILARITY_THRESHOLD
 
-                    if similarity >= COSINE_SIMILARITY_THRESHOLD:
-                        is_duplicate = True
-                        break
+            logger.debug(
+                "enforce_query_deduplication: Similarity to previous queries",
+                extra={
+                    "json_fields": {
+                        "max_similarity": max_similarity,
+                        "previous_queries": similarity_matrix.size,
+                    },
+                },
+            )
 
-            previous_embeddings.append(embedding)
-            cache[queries_key] = previous_embeddings
+            cache[queries_key] = np.vstack(
+                [
+                    previous_embeddings_matrix[
+                        -(MAX_REMEMBERED_QUERY_EMBEDDINGS - 1) :
+                    ],
+                    current_embedding_matrix,
+                ]
+            )
 
             if is_duplicate:
                 return {
@@ -157,6 +250,93 @@ def create_enforce_tool_call_limits_callback(
     return enforce_tool_call_limits
 
 
+def create_skip_scrape_when_snippets_suffice_callback(
+    cache: dict[str, Any], snippet_chars_threshold: int
+) -> Callable[[BaseTool, dict[str, Any], ToolContext], dict[str, Any] | None]:
+    def skip_scrape_when_snippets_suffice(
+        tool: BaseTool, args: dict[str, Any], tool_context: ToolContext
+    ) -> dict[str, Any] | None:
+        """Block scrape_tool when search snippets already carry enough evidence."""
+        if tool.name != "scrape_tool":
+            return None
+
+        snippet_chars = cache.get("search_snippet_chars", 0)
+        if snippet_chars <= snippet_chars_threshold:
+            return None
+
+        logger.info(
+            "skip_scrape_when_snippets_suffice: Skipping scrape_tool",
+            extra={
+                "json_fields": {
+                    "agent_name": tool_context.agent_name,
+                    "snippet_chars": snippet_chars,
+                    "snippet_chars_threshold": snippet_chars_threshold,
+                }
+            },
+        )
+        return {
+            "status": "error",
+            "message": (
+                "scrape_tool skipped: search snippets already provide enough "
+                "evidence; answer from the search results"
+            ),
+        }
+
+    return skip_scrape_when_snippets_suffice
+
+
+def create_prefilter_scrape_urls_callback(
+    cache: dict[str, Any],
+) -> Callable[[BaseTool, dict[str, Any], ToolContext], dict[str, Any] | None]:
+    def prefilter_scrape_urls(
+        tool: BaseTool, args: dict[str, Any], tool_context: ToolContext
+    ) -> dict[str, Any] | None:
+        """Drop duplicate, already scraped and non-text URLs from scrape_tool args.
+
+        The remaining URLs are capped at MAX_URLS_PER_SCRAPE. Blocks the call
+        when nothing is left to scrape.
+        """
+        if tool.name != "scrape_tool":
+            return None
+
+        scraped_urls: set[str] = cache.setdefault("scraped_urls", set())
+        urls: list[str] = []
+        for url in args.get("urls") or []:
+            page = url.split("#", 1)[0]
+            path = urlsplit(page).path.lower()
+            if page in scraped_urls or path.endswith(NON_TEXT_URL_EXTENSIONS):
+                continue
+            scraped_urls.add(page)
+            urls.append(page)
+            if len(urls) == MAX_URLS_PER_SCRAPE:
+                break
+
+        if len(urls) != len(args.get("urls") or []):
+            logger.info(
+                "prefilter_scrape_urls: Dropped URLs before scraping",
+                extra={
+                    "json_fields": {
+                        "agent_name": tool_context.agent_name,
+                        "requested": len(args.get("urls") or []),
+                        "kept": len(urls),
+                    }
+                },
+            )
+
+        if not urls:
+            return {
+                "status": "error",
+                "message": (
+                    "scrape_tool skipped: every URL was already scraped or is not "
+                    "a text page; answer from the evidence gathered so far"
+                ),
+            }
+        args["urls"] = urls
+        return None
+
+    return prefilter_scrape_urls
+
+
 def compose_before_tool_callbacks(
     callbacks: list[
         Callable[
@@ -212,19 +392,27 @@ def create_store_search_urls_callback(
         url_to_query_key = "url_to_query_mapping"
         url_to_query = cache.get(url_to_query_key, {})
 
+        # One pass maps URLs and totals the snippets
+        urls_count = 0
+        snippet_chars = 0
         for result in results:
             url = result.get("url")
             if url:
                 url_to_query[url] = query
+                urls_count += 1
+            snippet_chars += len(result.get("description") or "")
 
         cache[url_to_query_key] = url_to_query
+        cache["search_snippet_chars"] = (
+            cache.get("search_snippet_chars", 0) + snippet_chars
+        )
 
         logger.info(
             "store_search_urls: Stored URL->query mappings",
             extra={
                 "json_fields": {
                     "query": query,
-                    "urls_count": len([r for r in results if r.get("url")]),
+                    "urls_count": urls_count,
                     "total_mappings": len(url_to_query),
                 }
             },
@@ -250,19 +438,12 @@ def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 200) -> list[st
     if not text or len(text) <= chunk_size:
         return [text] if text else []
 
-    chunks = []
-    start = 0
-
-    while start < len(text):
-        end = start + chunk_size
-        chunk = text[start:end]
-
-        if chunk.strip():
-            chunks.append(chunk)
-
-        start += chunk_size - overlap
-
-    return chunks
+    # isspace() tests a chunk for content without building a stripped copy
+    return [
+        chunk
+        for start in range(0, len(text), chunk_size - overlap)
+        if not (chunk := text[start : start + chunk_size]).isspace()
+    ]
 
 
 def create_filter_scraped_content_callback(
@@ -278,6 +459,8 @@ def create_filter_scraped_content_callback(
     Create after_tool_callback for scrape_tool to filter content by embedding similarity.
 
     Uses stored URL->query mappings to filter scraped chunks by cosine similarity.
+    At most MAX_CHUNKS_PER_SCRAPED_URL chunks are kept per page: the most
+    similar ones, in document order, even when none meets the threshold.
     """
 
     async def filter_scraped_content(
@@ -304,7 +487,9 @@ def create_filter_scraped_content_callback(
         try:
             # Collect all unique queries and generate embeddings in one batch call
             unique_queries = list(
-                {query for query in url_to_query.values() if query and query.strip()}
+                dict.fromkeys(
+                    query for query in url_to_query.values() if query and query.strip()
+                )
             )
 
             if not unique_queries:
@@ -313,27 +498,10 @@ def create_filter_scraped_content_callback(
                 )
                 return None
 
-            query_embeddings_list = await embedding_service.generate_embeddings(
-                unique_queries, task_type="RETRIEVAL_QUERY"
-            )
-
-            query_embeddings_cache: dict[str, list[float]] = dict(
-                zip(unique_queries, query_embeddings_list, strict=True)
-            )
-
-            logger.info(
-                "filter_scraped_content: Generated embeddings for unique queries",
-                extra={
-                    "json_fields": {
-                        "unique_queries_count": len(unique_queries),
-                        "total_urls": len(combined_content),
-                    }
-                },
-            )
-
+            # Chunk every page first, so all chunks are embedded in one request
+            # that runs concurrently with the query embeddings
             filtered_combined_content: dict[str, str] = {}
-            total_original_chunks = 0
-            total_filtered_chunks = 0
+            page_chunks: dict[str, list[str]] = {}
 
             for url, content in combined_content.items():
                 if not content or not content.strip():
@@ -345,16 +513,9 @@ def create_filter_scraped_content_callback(
                         "filter_scraped_content: No query found for URL, skipping",
                         extra={"json_fields": {"url": url}},
                     )
-                    filtered_combined_content[url] = content
-                    continue
-
-                query_embedding = query_embeddings_cache.get(query)
-                if query_embedding is None:
-                    logger.warning(
-                        "filter_scraped_content: No embedding found for query, skipping",
-                        extra={"json_fields": {"url": url, "query": query}},
-                    )
-                    filtered_combined_content[url] = content
+                    filtered_combined_content[url] = content[
+                        : chunk_size * MAX_CHUNKS_PER_SCRAPED_URL
+                    ]
                     continue
 
                 chunks = chunk_text(content, chunk_size, chunk_overlap)
@@ -363,26 +524,66 @@ def create_filter_scraped_content_callback(
                     filtered_combined_content[url] = content
                     continue
 
-                total_original_chunks += len(chunks)
+                page_chunks[url] = chunks
 
-                chunk_embeddings = await embedding_service.generate_embeddings(
-                    chunks, task_type="RETRIEVAL_DOCUMENT"
-                )
+            all_chunks = [chunk for chunks in page_chunks.values() for chunk in chunks]
+            query_embeddings_list, chunk_embeddings = await asyncio.gather(
+                # Queries repeat across scrape calls; only new ones are fetched
+                _generate_embeddings_cached(cache, unique_queries, "RETRIEVAL_QUERY"),
+                embedding_service.generate_embeddings(
+                    all_chunks, task_type="RETRIEVAL_DOCUMENT"
+                ),
+            )
 
-                query_embedding_matrix = np.array([query_embedding])
-                chunk_embeddings_matrix = np.array(chunk_embeddings)
+            query_embeddings_cache: dict[str, list[float]] = dict(
+                zip(unique_queries, query_embeddings_list, strict=True)
+            )
+
+            logger.info(
+                "filter_scraped_content: Generated embeddings for queries and chunks",
+                extra={
+                    "json_fields": {
+                        "unique_queries_count": len(unique_queries),
+                        "chunks_count": len(all_chunks),
+                        "total_urls": len(combined_content),
+                    }
+                },
+            )
+
+            # Converting a few hundred 3072-float lists takes milliseconds;
+            # do it off the event loop so other agents' callbacks keep running
+            chunk_embeddings_matrix = await asyncio.to_thread(
+                _embedding_matrix, chunk_embeddings
+            )
+            total_original_chunks = len(all_chunks)
+            total_filtered_chunks = 0
+            page_start = 0
 
-                similarity_matrix = cosine_similarity(
-                    chunk_embeddings_matrix, query_embedding_matrix
+            for url, chunks in page_chunks.items():
+                content = combined_content[url]
+                page_embeddings_matrix = chunk_embeddings_matrix[
+                    page_start : page_start + len(chunks)
+                ]
+                page_start += len(chunks)
+
+                query_embedding_matrix = _normalize_rows(
+                    np.asarray(
+                        [query_embeddings_cache[url_to_query[url]]], dtype=np.float32
+                    )
                 )
 
-                similarities = similarity_matrix.flatten()
+                similarities = page_embeddings_matrix @ query_embedding_matrix[0]
 
-                high_similarity_indices = [
-                    i
-                    for i, sim in enumerate(similarities)
-                    if sim >= similarity_threshold
+                # Best chunks first; keep those above the threshold, falling
+                # back to the closest ones when none qualifies
+                ranked_indices = np.argsort(similarities)[::-1][
+                    :MAX_CHUNKS_PER_SCRAPED_URL
                 ]
+                high_similarity_indices = sorted(
+                    int(i)
+                    for i in ranked_indices
+                    if similarities[i] >= similarity_threshold
+                )
 
                 if not high_similarity_indices:
                     logger.warning(
@@ -395,8 +596,7 @@ def create_filter_scraped_content_callback(
                             }
                         },
                     )
-                    filtered_combined_content[url] = content
-                    continue
+                    high_similarity_indices = sorted(int(i) for i in ranked_indices)
 
                 filtered_chunks = [chunks[i] for i in high_similarity_indices]
                 total_filtered_chunks += len(filtered_chunks)
@@ -408,7 +608,6 @@ def create_filter_scraped_content_callback(
                     extra={
                         "json_fields": {
                             "url": url,
-                            "filtered_combined_content": filtered_combined_content[url],
                             "length_of_filtered_combined_content": len(
                                 filtered_combined_content[url]
                             ),
@@ -431,7 +630,12 @@ def create_filter_scraped_content_callback(
 
             return {
                 "status": tool_response.get("status", "success"),
-                "combined_content": filtered_combined_content,
+                # Pages keep the order scrape_tool returned them in
+                "combined_content": {
+                    url: filtered_combined_content[url]
+                    for url in combined_content
+                    if url in filtered_combined_content
+                },
             }
 
         except Exception:
@@ -475,18 +679,27 @@ def compose_after_tool_callbacks(
 
 
 def create_combined_before_tool_callback(
-    cache: dict[str, Any], tool_max_calls: dict[str, int]
+    cache: dict[str, Any],
+    tool_max_calls: dict[str, int],
+    snippet_chars_threshold: int = SNIPPET_CHARS_SKIP_SCRAPE_THRESHOLD,
 ) -> Callable[[BaseTool, dict[str, Any], ToolContext], dict[str, Any] | None]:
     """
     Chain multiple before-tool callbacks in sequence.
 
-    First checks query deduplication, then enforces tool call limits.
+    First checks query deduplication, then skips scraping when search snippets
+    suffice, then prefilters scrape URLs, then enforces tool call limits.
     If any callback returns a dict (error/skip), stop and return it.
     """
     dedup_callback = create_enforce_query_deduplication_callback(cache)
+    skip_scrape_callback = create_skip_scrape_when_snippets_suffice_callback(
+        cache, snippet_chars_threshold
+    )
+    prefilter_urls_callback = create_prefilter_scrape_urls_callback(cache)
     limit_callback = create_enforce_tool_call_limits_callback(cache, tool_max_calls)
 
-    return compose_before_tool_callbacks([dedup_callback, limit_callback])
+    return compose_before_tool_callbacks(
+        [dedup_callback, skip_scrape_callback, prefilter_urls_callback, limit_callback]
+    )
 
 
 def create_combined_after_tool_callback(
@@ -506,278 +719,301 @@ def create_combined_after_tool_callback(
     return compose_after_tool_callbacks([store_urls_callback, filter_content_callback])
 
 
-def create_single_question_research_agent(
-    question: str, output_key: str, priority: str
-) -> LlmAgent:
-    """
-    Factory function to create a new instance of a UnifiedResearchAgent.
-    This is necessary to comply with ADK's single-parent rule for agents.
-    """
-    current_date = datetime.now().strftime("%B %d, %Y")
+_RESEARCH_INSTRUCTION_TEMPLATE = """You are a research agent. Answer the research question below with verifiable
+evidence gathered through search and scraping tools.
 
-    # Create shared cache for callbacks
-    callback_cache: dict[str, Any] = {}
+Today's date is {current_date}. Use it for "current", "latest" or other
+time-sensitive questions.
 
-    # Define priority-based limits
-    priority_limits = {
-        "high": {"search_tool": 4, "scrape_tool": 2},
-        "medium": {"search_tool": 2, "scrape_tool": 1},
-        "low": {"search_tool": 1, "scrape_tool": 0},
-    }
+## EVIDENCE RULES
 
-    limits = priority_limits.get(priority, priority_limits["medium"])
-    max_search_calls = limits["search_tool"]
-    max_scrape_calls = limits["scrape_tool"]
+- Every factual claim must come from search results or scraped content, never
+  from training data. Use your own knowledge only for reasoning and planning.
+- Cite only URLs returned by the tools. Each citation is a verbatim excerpt
+  (a search snippet or a quote from a scraped page) from that exact URL: full
+  https:// URL, no homepages, search pages or shortened links.
+- Prefer official sources, then government/regulatory filings, major news,
+  industry publications and academic work.
 
-    tool_max_calls: dict[str, int] = {
-        "search_tool": max_search_calls,
-        "scrape_tool": max_scrape_calls,
-    }
+## TOOLS
 
-    return LlmAgent(
-        # Each agent instance needs a unique name.
-        name=f"UnifiedResearchAgent_{output_key}",
-        model=settings.GEMINI_2_5_FLASH_MODEL,
-        description=f"Intelligent research agent for: {question[:100]}...",
-        instruction=f"""You are an intelligent research agent. Your task is to thoroughly research
-the given question by strategically using search and scraping tools to gather
-comprehensive, verifiable evidence.
+- search_tool (up to {max_search_calls} calls): pass short, focused queries for
+  one aspect of the question (entity + event + timeframe), never the full
+  question. Refine each query using what the previous results left open.
+- scrape_tool (up to {max_scrape_calls} calls, max 5 URLs per call): only when
+  snippets from authoritative sources lack decisive detail. Skip it when
+  snippets already answer the question, sources are low quality, or results
+  conflict in ways scraping won't resolve.
+- Tool calls made in the same turn run in parallel: issue queries that do not
+  depend on each other's results together, and put every URL you need into a
+  single scrape_tool call.
 
-## CURRENT DATE
+Example: "Is Alice Kim CTO of Acme Corp as of {current_date}?" -> search
+"Alice Kim CTO Acme Corp", then "Acme Corp leadership team" or
+"Alice Kim Acme Corp resignation" depending on the first results.
 
-**Today's date is: {current_date}**
+Stop searching once the evidence answers the question fully.
 
-Use this date when the question asks about "current", "as of today", "latest",
-or any time-sensitive information. This is the reference point for all temporal
-queries.
+## ANSWER
 
-## CRITICAL REQUIREMENT - NO TRAINING DATA
+Address the full question with specific facts, dates, numbers and as-of
+dates. Cross-reference sources, present both sides of any conflict, and
+state explicitly what could not be found. Copy the research question
+exactly into the answer's question field.
 
-**YOU MUST NOT use any factual information from your training data**
+---
 
-- ALL factual claims MUST come from search results and scraped content
-- Your training data may ONLY be used for:
-  - Logic and reasoning capabilities
-  - Understanding language and context
-  - Analytical frameworks that don't change over time
-  - Planning research strategy
-- MANDATORY: Use search_tool for ALL factual research
+**Research Question**: """
 
-## YOUR TOOLS
 
-**search_tool (use up to {max_search_calls} times)**:
-- Takes a query string (can be any length - powered by LLM)
-- Returns search results with titles, snippets, and URLs
-- Use for exploration and finding authoritative sources
+RESEARCH_DATE_FORMAT = "%B %d, %Y"
 
-**scrape_tool (use up to {max_scrape_calls} time)**:
-- Takes a list of URLs (maximum 5 URLs per call)
-- Returns full page content from those URLs
-- Use only when search snippets are insufficient
 
-## QUESTION DECOMPOSITION STRATEGY (CRITICAL)
+@lru_cache(maxsize=8)
+def _format_pipeline_date(pipeline_date: str) -> str:
+    """Render the ISO pipeline date as the prompts show it."""
+    return date.fromisoformat(pipeline_date).strftime(RESEARCH_DATE_FORMAT)
 
-The research question is complex and cannot be answered with a single search query.
-You MUST decompose it into targeted exploration areas.
 
-DECOMPOSITION APPROACH:
-1. **Analyze the question** - identify key components, entities, timeframes, numbers
-2. **Break into sub-queries** - create 2-3 focused search queries that together cover the question
-3. **Sequential refinement** - use first search to inform second search
+def _research_date(pipeline_date: str | None) -> str:
+    """Return the prompt date: the frozen pipeline date, else today.
 
-DO NOT pass the full question to search_tool - it's too complex!
-Instead, create FOCUSED, TARGETED search queries for specific aspects.
+    Only frozen dates are memoized; today's date is read on every call so a
+    long-running process never serves a stale day.
+    """
+    if not pipeline_date:
+        return datetime.now().strftime(RESEARCH_DATE_FORMAT)
+    return _format_pipeline_date(pipeline_date)
+
+
+# The question text always comes last in the instructions, so everything before
+# it is rendered once per (date, tool budget) and shared by every agent built
+# with those values; per-question work is one string concatenation.
+@lru_cache(maxsize=32)
+def _research_instruction_prefix(
+    current_date: str, max_search_calls: int, max_scrape_calls: int
+) -> str:
+    return _RESEARCH_INSTRUCTION_TEMPLATE.format(
+        current_date=current_date,
+        max_search_calls=max_search_calls,
+        max_scrape_calls=max_scrape_calls,
+    )
 
-### Decomposition Examples:
 
-Question: "Is Alice Kim currently serving as CTO of Acme Corp as of {current_date}?"
+@lru_cache(maxsize=32)
+def _batched_research_instruction_prefix(
+    current_date: str, max_search_calls: int, max_scrape_calls: int
+) -> str:
+    return _BATCHED_RESEARCH_INSTRUCTION_TEMPLATE.format(
+        current_date=current_date,
+        max_search_calls=max_search_calls,
+        max_scrape_calls=max_scrape_calls,
+    )
 
-Decomposition strategy:
-- Search 1: "Alice Kim CTO Acme Corp 2025" (find current status)
-- Search 2: "Acme Corp leadership team 2025" (verify from company side)
-- OR if Search 1 unclear: "Alice Kim Acme Corp departure resignation" (check if she left)
 
-Question: "When did Tesla officially begin Cybertruck production according to company announcements?"
+def research_model_name(priority: str) -> str:
+    """Return the name of the model that researches `priority` questions."""
+    return PRIORITY_MODELS.get(priority, settings.GEMINI_2_5_FLASH_MODEL)
 
-Decomposition strategy:
-- Search 1: "Tesla Cybertruck production start date official announcement"
-- Search 2: "Tesla Cybertruck manufacturing 2023 2024" (if first search needs temporal refinement)
-- OR: "Tesla Cybertruck factory Austin production timeline" (if need location context)
 
-Question: "What was Acme Corp's exact revenue in Q4 2023 according to official reports?"
+def _research_model(priority: str) -> Gemini:
+    """Return the shared model instance that researches `priority` questions."""
+    return get_gemini_model(research_model_name(priority))
 
-Decomposition strategy:
-- Search 1: "Acme Corp Q4 2023 revenue earnings report"
-- Search 2: "Acme Corp 2023 annual financial results SEC filing" (if need official source)
 
-## MULTI-SEARCH STRATEGY
+# Prototype agents; the factories clone them per question instead of rebuilding
+# the model config and tool list from scratch. Clones share the model and tools.
+unified_research_agent = LlmAgent(
+    name="UnifiedResearchAgent",
+    model=get_gemini_model(settings.GEMINI_2_5_FLASH_MODEL),
+    description="Intelligent research agent for a single gap question",
+    tools=[
+        groq_search_tool,
+        scrape_websites_tool,
+    ],
+    output_schema=ResearchAnswerOutput,
+)
+
+batched_research_agent = LlmAgent(
+    name="BatchedResearchAgent",
+    model=get_gemini_model(settings.GEMINI_2_5_FLASH_MODEL),
+    description="Batched research agent for several gap questions",
+    tools=[
+        groq_search_tool,
+        scrape_websites_tool,
+    ],
+    output_schema=BatchedResearchOutput,
+)
 
-You have {max_search_calls} search calls - use them strategically:
 
-**APPROACH A - Broad then Narrow:**
-- Search 1: Broad query covering main question
-- Search 2: Narrow query based on gaps from Search 1
+def create_single_question_research_agent(
+    question: str, output_key: str, priority: str, pipeline_date: str | None = None
+) -> LlmAgent:
+    """
+    Factory function to create a new instance of a UnifiedResearchAgent.
+    This is necessary to comply with ADK's single-parent rule for agents; the
+    instance is a shallow clone of `unified_research_agent`. `pipeline_date`
+    is the run's frozen ISO date; without it the agent uses today's date.
+    """
+    current_date = _research_date(pipeline_date)
 
-**APPROACH B - Different Angles:**
-- Search 1: Direct entity/event query
-- Search 2: Alternative angle (company perspective, time-based, official sources)
+    # Create shared cache for callbacks
+    callback_cache: dict[str, Any] = {}
 
-**APPROACH C - Temporal Refinement:**
-- Search 1: General query with entity names
-- Search 2: Add specific timeframe or "latest news" or "as of 2025"
+    limits = PRIORITY_TOOL_LIMITS.get(priority, PRIORITY_TOOL_LIMITS["medium"])
+    max_search_calls = limits["search_tool"]
+    max_scrape_calls = limits["scrape_tool"]
 
-**Choose the approach** based on the question type and what you learn from Search 1.
+    tool_max_calls: dict[str, int] = {
+        "search_tool": max_search_calls,
+        "scrape_tool": max_scrape_calls,
+    }
 
-## SCRAPING DECISION FRAMEWORK
+    return unified_research_agent.clone(
+        update={
+            # Each agent instance needs a unique name.
+            "name": f"UnifiedResearchAgent_{output_key.replace(':', '_')}",
+            "model": _research_model(priority),
+            "instruction": _research_instruction_prefix(
+                current_date, max_search_calls, max_scrape_calls
+            )
+            + question,
+            "before_tool_callback": create_combined_before_tool_callback(
+                callback_cache, tool_max_calls
+            ),
+            "after_tool_callback": create_combined_after_tool_callback(callback_cache),
+            "output_key": output_key,
+        }
+    )
 
-Use scrape_tool ONLY if:
-✓ Search snippets mention key facts but lack sufficient detail
-✓ You found authoritative sources (official docs, announcements, reports)
-✓ Snippets reference specific data but don't show full context
-✓ Multiple sources point to same URL as definitive source
 
-DO NOT scrape if:
-✗ Search snippets already provide complete answer
-✗ URLs are low-quality sources (forums, blogs, aggregators)
-✗ No clear authoritative source emerged from search
-✗ Search results are contradictory (scraping won't resolve)
+def can_batch_questions(questions: list[str]) -> bool:
+    """Whether the questions are short enough to share one research prompt."""
+    return all(len(question) <= MAX_BATCHED_QUESTION_LENGTH for question in questions)
 
-**When scraping**: Select up to 5 most authoritative URLs from search results.
-Priority: official websites > news organizations > academic > industry publications
 
-## RESEARCH WORKFLOW
+def create_fan_out_batched_answers_callback(
+    batch_output_key: str, output_keys: list[str]
+) -> Callable[[CallbackContext], None]:
+    """
+    Create after_agent_callback that splits a batched answer into per-question keys.
 
-### Step 1: Decompose Question
-- Analyze the question and identify key components
-- Break into {max_search_calls}-3 focused search-friendly queries
-- Plan your search strategy (broad-narrow, multi-angle, or temporal)
+    Each answer is stored under the output key of its question in the same
+    shape the single-question agent writes (a ResearchAnswerOutput dict), so
+    callers need not know whether a question was researched alone or in a
+    batch.
+    """
 
-### Step 2: Execute Search Calls (up to {max_search_calls} times)
-- **For each search call**:
-  - Use search_tool with focused query (NOT the full question)
-  - Review results: titles, snippets, URLs, source quality
-  - Evaluate what you learned and what gaps remain
+    def fan_out_batched_answers(callback_context: CallbackContext) -> None:
+        batched_output = callback_context.state.get(batch_output_key)
+        if not batched_output:
+            logger.warning(
+                "fan_out_batched_answers: No batched answers found",
+                extra={"json_fields": {"batch_output_key": batch_output_key}},
+            )
+            return None
+
+        for answer in batched_output.get("answers", []):
+            index = answer.get("question_id", 0) - 1
+            if not 0 <= index < len(output_keys):
+                logger.warning(
+                    "fan_out_batched_answers: Answer for unknown question",
+                    extra={"json_fields": {"question_id": answer.get("question_id")}},
+                )
+                continue
 
-- **Between search calls**:
-  - Assess if current snippets can answer the question
-  - Identify what's still missing or unclear
-  - Refine next query based on findings
-  - Note any authoritative URLs worth scraping
+            callback_context.state[output_keys[index]] = {
+                "question": answer.get("question", ""),
+                "detailed_answer": answer.get("detailed_answer", ""),
+                "sources": answer.get("sources", []),
+            }
+        return None
 
-- **Stop searching if**:
-  - You have sufficient information to answer comprehensively
-  - You've used all {max_search_calls} search calls
-  - Additional searches unlikely to add value
+    return fan_out_batched_answers
 
-### Step 3: Scrape (if needed, up to {max_scrape_calls} time)
-- **Evaluate scraping value**:
-  - Do search snippets lack critical details?
-  - Did you find authoritative sources needing full content?
-  - Will scraping provide decisive evidence?
 
-- **If scraping**:
-  - Select up to 5 most authoritative URLs from search results
-  - Use scrape_tool with selected URLs
-  - Extract relevant quotes and evidence
+_BATCHED_RESEARCH_INSTRUCTION_TEMPLATE = """You are an intelligent research agent. Research EACH numbered
+question below independently, using search and scraping tools to gather
+verifiable evidence.
 
-### Step 4: Synthesize Answer
-- Combine ALL evidence from search calls and scraping (if used)
-- Construct comprehensive answer addressing the full question
-- Ensure every factual claim is backed by a source
-- Note any limitations, conflicts, or uncertainties found
+**Today's date is: {current_date}** - use it for "current", "latest" or other
+time-sensitive questions.
 
-## SOURCE CAPTURE RULES (MANDATORY)
+## RULES
 
-**From search_tool**:
-- You MAY use the search snippet verbatim as the citation
-- You MUST attach the exact result URL that snippet came from
-- Format: {{"url": "https://...", "citation": "snippet text..."}}
-
-**From scrape_tool**:
-- You MUST quote verbatim text from the scraped page
-- The URL MUST be exactly one of the URLs passed to scrape_tool
-- Format: {{"url": "https://exact-scraped-url.com", "citation": "exact quote from page..."}}
-
-**Source quality priority**:
-1. Official company/organization websites
-2. Government sites, SEC filings, official registries
-3. Major news organizations
-4. Industry publications and trade journals
-5. Academic sources
+- ALL factual claims MUST come from search results and scraped content; never
+  use facts from your training data
+- search_tool (up to {max_search_calls} calls in total): pass focused queries for
+  one aspect of one question, never a full question
+- scrape_tool (up to {max_scrape_calls} calls in total, maximum 5 URLs per call):
+  use only when search snippets lack decisive detail from authoritative sources
+- A query or scrape may serve several questions when they share entities
+- Tool calls made in the same turn run in parallel: issue the first query for
+  every question together, and put every URL you need into one scrape_tool call
+- Cite only URLs returned by the tools; each citation must be a verbatim
+  excerpt from that exact URL
+- If a question cannot be answered from the evidence, say so explicitly
 
 ## OUTPUT FORMAT
 
-Return a JSON object with this exact structure:
-{{
-    "question": "The original research question (copy exactly)",
-    "detailed_answer": "Comprehensive answer addressing the full question with context, evidence, and analysis. Include specific facts, dates, numbers, and sources. If information is conflicting or uncertain, note this explicitly.",
-    "sources": [
-        {{
-            "url": "https://example.com/path-to-exact-page",
-            "citation": "Verbatim quote or key datum from that exact URL"
-        }}
-    ]
-}}
-
-## QUALITY REQUIREMENTS
-
-**Comprehensiveness**:
-- Answer must fully address the research question
-- Include all relevant facts, dates, numbers, names found
-- Provide context that helps verify/refute related claims
-- Note any qualifiers, conditions, or uncertainties
-
-**Evidence-based**:
-- Every factual statement must be sourced
-- Cross-reference when multiple sources confirm same fact
-- Acknowledge conflicts between sources if found
-- State explicitly if information cannot be found
-
-**Source quality**:
-- Prioritize authoritative, primary sources
-- Include URL and citation for each source
-- URL must be the exact page where citation appears
-- Citation must be verbatim excerpt (prefer direct quotes)
-
-**Transparency**:
-- If answer is incomplete, state what's missing
-- If sources conflict, present both perspectives
-- If timeframe is critical, note as-of dates from sources (remember: today is {current_date})
-- If no reliable information found, state this clearly
-
-## MANDATORY URL-CITATION CONSISTENCY
-
-For every item in "sources" array:
-- **url**: Exact page where citation text appears
-  - Include full protocol: https://
-  - No homepages unless citation is from homepage
-  - No search pages or aggregator pages
-  - No shortened URLs - use full canonical URL
-  - For PDFs, include fragment if available: #page=3
-
-- **citation**: Verbatim excerpt from that exact URL
-  - Prefer direct quotes in quotation marks
-  - If paraphrasing, it must be close paraphrase of specific content
-  - Must be traceable to the specific URL provided
-  - Include enough context to be meaningful
-
-- Do not include any source without a specific citation
-- Do not cite training data or general knowledge
+Return one answer per question, using the question's number as question_id
+and copying the question exactly. Each answer gives dates, numbers and caveats.
 
 ---
 
-**Research Question**: {question}
-
-Begin by analyzing the question and planning your search decomposition strategy.
-Then execute your research workflow systematically.
-""",
-        tools=[
-            groq_search_tool,
-            scrape_websites_tool,
-        ],
-        before_tool_callback=create_combined_before_tool_callback(
-            callback_cache, tool_max_calls
-        ),
-        after_tool_callback=create_combined_after_tool_callback(callback_cache),
-        output_key=output_key,
+**Research Questions**:
+"""
+
+
+def create_batched_research_agent(
+    questions: list[str],
+    output_keys: list[str],
+    priority: str,
+    pipeline_date: str | None = None,
+) -> LlmAgent:
+    """
+    Factory function to research several questions with a single LlmAgent.
+
+    Row-marshals the questions into one numbered prompt so the instruction and
+    per-call overhead are paid once per batch instead of once per question. Tool
+    budgets scale with the number of questions in the batch.
+    """
+    if len(questions) != len(output_keys):
+        raise ValueError("Each batched question needs exactly one output key")
+
+    current_date = _research_date(pipeline_date)
+    callback_cache: dict[str, Any] = {}
+
+    limits = PRIORITY_TOOL_LIMITS.get(priority, PRIORITY_TOOL_LIMITS["medium"])
+    max_search_calls = limits["search_tool"] * len(questions)
+    max_scrape_calls = limits["scrape_tool"] * len(questions)
+    batch_tool_max_calls: dict[str, int] = {
+        "search_tool": max_search_calls,
+        "scrape_tool": max_scrape_calls,
+    }
+
+    batch_output_key = f"{output_keys[0]}_batch"
+    numbered_questions = "\n".join(
+        f"{number}. {question}" for number, question in enumerate(questions, start=1)
+    )
+
+    return batched_research_agent.clone(
+        update={
+            "name": f"BatchedResearchAgent_{output_keys[0].replace(':', '_')}",
+            "model": _research_model(priority),
+            "instruction": _batched_research_instruction_prefix(
+                current_date, max_search_calls, max_scrape_calls
+            )
+            + numbered_questions,
+            "before_tool_callback": create_combined_before_tool_callback(
+                callback_cache,
+                batch_tool_max_calls,
+                SNIPPET_CHARS_SKIP_SCRAPE_THRESHOLD * len(questions),
+            ),
+            "after_tool_callback": create_combined_after_tool_callback(callback_cache),
+            "after_agent_callback": create_fan_out_batched_answers_callback(
+                batch_output_key, output_keys
+            ),
+            "output_key": batch_output_key,
+        }
     )
@@ -8,13 +8,14 @@ from google.adk.planners import BuiltInPlanner
 from google.genai import types
 from google.genai.types import GenerateContentConfig
 
+from ...core.llm import get_gemini_model
 from ...core.models import EvidenceAdjudicatorOutput
 from ...core.settings import settings
 
 MODEL = settings.GEMINI_2_5_FLASH_MODEL
 
 evidence_adjudicator_agent = Agent(
-    model=MODEL,
+    model=get_gemini_model(MODEL),
     name="EvidenceAdjudicatorAgent",
     description=(
         "Primary fact-checking agent. Synthesizes provided research into a "
@@ -36,7 +36,10 @@ def transform_adjudicated_report(
     # Generate markdown string for reason field
     reason_markdown = _generate_reason_markdown(adjudicated_report)
 
-    logger.info(f"Reason markdown: {reason_markdown}")
+    logger.debug(
+        "Generated reason markdown",
+        extra={"json_fields": {"reason_length": len(reason_markdown)}},
+    )
 
     # Map easily mappable fields
     return TransformationOutput(
@@ -0,0 +1,122 @@
+# File: src/wal_fact_checker/core/llm.py
+"""Gemini model instances shared by all agents."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncGenerator
+from functools import cache, cached_property
+from typing import Any, Final
+
+import httpx
+from google.adk.models import Gemini, LlmRequest, LlmResponse
+from google.genai import Client, types
+
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses retried with exponential backoff: rate limiting and overload
+RETRYABLE_STATUS_CODES: Final[list[int]] = [429, 503]
+GEMINI_API_URL: Final[str] = "https://generativelanguage.googleapis.com/"
+
+
+def gemini_quota_concurrency() -> int:
+    """Concurrent requests the Gemini quota sustains, by Little's law."""
+    return max(1, int(settings.gemini_rpm * settings.gemini_avg_latency_seconds / 60))
+
+
+@cache
+def get_gemini_semaphore() -> asyncio.Semaphore:
+    """Return the process-wide gate on in-flight Gemini requests.
+
+    Shared by every agent and every concurrently processed document, so
+    parallel requests scale up to the project quota instead of past it.
+    """
+    return asyncio.Semaphore(gemini_quota_concurrency())
+
+
+@cache
+def get_gemini_transport() -> httpx.AsyncHTTPTransport:
+    """Return the HTTP/2 transport whose connection pool all Gemini models share."""
+    return httpx.AsyncHTTPTransport(
+        http2=True,
+        retries=settings.max_retries,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    )
+
+
+async def prewarm_gemini_connection() -> None:
+    """Open the pooled Gemini connection ahead of the first request."""
+    request = httpx.Request("HEAD", GEMINI_API_URL)
+    try:
+        response = await get_gemini_transport().handle_async_request(request)
+        await response.aclose()
+    except httpx.HTTPError:
+        logger.warning("Failed to pre-warm Gemini connection", exc_info=True)
+
+
+class Http2Gemini(Gemini):
+    """Gemini model whose async requests go over a pooled HTTP/2 connection.
+
+    Passing an explicit httpx transport makes google-genai use httpx instead of
+    aiohttp, so concurrent agent calls multiplex over one TCP+TLS connection.
+    """
+
+    @cached_property
+    def api_client(self) -> Client:
+        kwargs: dict[str, Any] = {
+            "http_options": types.HttpOptions(
+                headers=self._tracking_headers(),
+                retry_options=self.retry_options,
+                base_url=self.base_url,
+                async_client_args={"transport": get_gemini_transport()},
+            )
+        }
+        if self.model.startswith("projects/"):
+            kwargs["vertexai"] = True
+
+        return Client(**kwargs)
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        # Hold the quota permit only for the upstream request: while this
+        # generator is paused at `yield`, ADK runs after-model callbacks and
+        # tools, which must neither count as Gemini load nor wait on a permit
+        # this call still holds. Streamed chunks are buffered as a result.
+        async with get_gemini_semaphore():
+            llm_responses = [
+                llm_response
+                async for llm_response in super().generate_content_async(
+                    llm_request, stream=stream
+                )
+            ]
+        for llm_response in llm_responses:
+            yield llm_response
+
+
+@cache
+def get_gemini_model(model: str) -> Gemini:
+    """Return the shared model instance for `model`."""
+    return Http2Gemini(
+        model=model,
+        retry_options=types.HttpRetryOptions(
+            attempts=settings.max_retries + 1,
+            initial_delay=1.0,
+            max_delay=30.0,
+            exp_base=2.0,
+            http_status_codes=RETRYABLE_STATUS_CODES,
+        ),
+    )
+
+
+__all__ = [
+    "Http2Gemini",
+    "gemini_quota_concurrency",
+    "get_gemini_model",
+    "get_gemini_semaphore",
+    "get_gemini_transport",
+    "prewarm_gemini_connection",
+]
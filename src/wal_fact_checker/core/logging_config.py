@@ -5,12 +5,17 @@ from __future__ import annotations
 
 import logging
 import sys
+from functools import cache
 
 import structlog
 
 
+@cache
 def setup_logging() -> None:
-    """Configure logging for the application based on ADK best practices."""
+    """Configure logging for the application based on ADK best practices.
+
+    Cached so repeated imports do not rebuild the root handler.
+    """
     formatter = structlog.stdlib.ProcessorFormatter(
         foreign_pre_chain=[structlog.stdlib.ExtraAdder()],
         processors=[
@@ -84,6 +84,23 @@ class StructuredClaimsOutput(BaseModel):
     )
 
 
+class DocumentClaimsOutput(BaseModel):
+    """Structured claims for one document inside a batched response."""
+
+    id: str = Field(description="ID of the document, as given in the prompt")
+    claims: list[AtomicClaimOutput] = Field(
+        description="List of structured atomic claims for this document"
+    )
+
+
+class BatchedStructuredClaimsOutput(BaseModel):
+    """Output schema for batched claim structuring."""
+
+    documents: list[DocumentClaimsOutput] = Field(
+        description="One entry per input document"
+    )
+
+
 class GapQuestionOutput(BaseModel):
     """Pydantic schema for gap question output."""
 
@@ -93,9 +110,7 @@ class GapQuestionOutput(BaseModel):
     question_type: str = Field(
         description="Type: temporal, quantifiable, ambiguous, or implicit"
     )
-    priority: str = Field(
-        description="Priority of the question: high, medium, or low"
-    )
+    priority: str = Field(description="Priority of the question: high, medium, or low")
 
 
 class GapQuestionsOutput(BaseModel):
@@ -210,6 +225,50 @@ class CritiqueOutput(BaseModel):
     final_assessment: str = Field(description="Final overall assessment")
 
 
+class ResearchSourceOutput(BaseModel):
+    """Pydantic schema for a single research source."""
+
+    url: str = Field(description="Exact URL of the page the citation comes from")
+    citation: str = Field(
+        description="Verbatim quote or key datum taken from that exact URL"
+    )
+
+
+class ResearchAnswerOutput(BaseModel):
+    """Output schema for the single-question research agent."""
+
+    question: str = Field(description="The original research question")
+    detailed_answer: str = Field(
+        description="Comprehensive, evidence-based answer to the question"
+    )
+    sources: list[ResearchSourceOutput] = Field(
+        description="Sources backing the answer"
+    )
+
+
+class BatchedResearchAnswerOutput(BaseModel):
+    """Answer to one question inside a batched research response."""
+
+    question_id: int = Field(
+        description="Number of the question being answered, as listed in the prompt"
+    )
+    question: str = Field(description="The original research question")
+    detailed_answer: str = Field(
+        description="Comprehensive, evidence-based answer to the question"
+    )
+    sources: list[ResearchSourceOutput] = Field(
+        description="Sources backing the answer"
+    )
+
+
+class BatchedResearchOutput(BaseModel):
+    """Output schema for the batched research agent."""
+
+    answers: list[BatchedResearchAnswerOutput] = Field(
+        description="One answer per numbered research question"
+    )
+
+
 class ScrapeInput(BaseModel):
     """Pydantic schema for scrape input."""
 
@@ -4,6 +4,8 @@
 from __future__ import annotations
 
 import os
+from functools import lru_cache
+from typing import Any
 
 from dotenv import load_dotenv
 from pydantic import Field
@@ -37,6 +39,91 @@ class AppSettings(BaseSettings):
         default=10000, description="Maximum content length for processing"
     )
 
+    # Claim structuring settings
+    claim_structuring_batch_window_ms: int = Field(
+        default=0,
+        description=(
+            "Window for coalescing concurrent claim structuring requests into "
+            "one model call; 0 disables batching"
+        ),
+    )
+    claim_structuring_max_batch_size: int = Field(
+        default=8,
+        description="Maximum number of documents structured in one model call",
+    )
+
+    claim_structuring_fast_model: str = Field(
+        default="",
+        description=(
+            "Small Groq-hosted model that structures short inputs before "
+            "Gemini is tried; empty disables the fast path"
+        ),
+    )
+    claim_structuring_fast_min_confidence: float = Field(
+        default=0.8,
+        description="Lowest claim confidence accepted from the fast model",
+    )
+
+    # Gap identification settings
+    gap_prefilter_enabled: bool = Field(
+        default=False,
+        description=(
+            "Give simple dated past-event claims a templated source question "
+            "instead of sending them to the gap identification model"
+        ),
+    )
+
+    # Persistent response store
+    response_store_path: str = Field(
+        default="",
+        description=(
+            "SQLite file persisting structured claims, gap questions and "
+            "research answers across runs; empty disables persistence"
+        ),
+    )
+    response_store_ttl_seconds: int = Field(
+        default=30 * 24 * 60 * 60,
+        description="How long persisted structured claims stay valid",
+    )
+
+    # Research settings
+    research_batch_size: int = Field(
+        default=1,
+        description=(
+            "Number of gap questions researched by a single LLM agent; "
+            "1 researches every question independently"
+        ),
+    )
+    research_timeout_seconds: float = Field(
+        default=0.0,
+        description=(
+            "Deadline for the whole research stage; unfinished questions are "
+            "dropped so one slow question cannot stall synthesis. 0 disables it"
+        ),
+    )
+    research_question_timeout_seconds: float = Field(
+        default=180.0,
+        description=(
+            "Time a single research worker may run before it is cancelled and "
+            "its question left unanswered; 0 disables it"
+        ),
+    )
+    scrape_tool_timeout_seconds: float = Field(
+        default=15.0,
+        description=(
+            "Deadline for one scrape tool call; pages still loading are "
+            "reported as timed out so the agent continues with the rest. "
+            "0 waits for every page"
+        ),
+    )
+    research_cache_ttl_seconds: int = Field(
+        default=6 * 60 * 60,
+        description=(
+            "How long a research answer is reused for the same or a "
+            "paraphrased question; 0 disables the cache"
+        ),
+    )
+
     groq_key: str = Field(default="", description="Groq API key")
 
     google_api_key: str = Field(
@@ -62,6 +149,37 @@ class AppSettings(BaseSettings):
     GEMINI_2_5_FLASH_MODEL: str = Field(
         default="gemini-2.5-flash", description="Gemini 2.5 Flash model name"
     )
+    gemini_rpm: int = Field(
+        default=2000, description="Gemini requests-per-minute quota for the project"
+    )
+    gemini_avg_latency_seconds: float = Field(
+        default=6.0, description="Typical Gemini request latency in seconds"
+    )
+    gemini_context_cache_ttl_seconds: int = Field(
+        default=3600,
+        description=(
+            "TTL of the explicit Gemini caches holding static agent "
+            "instructions; 0 disables context caching"
+        ),
+    )
+    CLAIM_STRUCTURING_MODEL: str = Field(
+        default="gemini-2.5-flash-lite",
+        description="Model used for claim structuring (structured extraction)",
+    )
+    GAP_IDENTIFICATION_MODEL: str = Field(
+        default="gemini-2.5-flash-lite",
+        description=(
+            "Model used for gap identification; responses failing validation "
+            "are retried on GEMINI_2_5_FLASH_MODEL"
+        ),
+    )
+    RESEARCH_LOW_PRIORITY_MODEL: str = Field(
+        default="gemini-2.5-flash-lite",
+        description=(
+            "Model used to research low-priority gap questions; higher "
+            "priorities use GEMINI_2_5_FLASH_MODEL"
+        ),
+    )
 
     port: int = Field(description="Port number")
 
@@ -79,6 +197,16 @@ class AppSettings(BaseSettings):
         file_secret_settings: PydanticBaseSettingsSource,
     ) -> tuple[PydanticBaseSettingsSource, ...]:
         project_id = os.getenv("GCP_PROJECT_ID")
+        if not project_id:
+            # Without a project there is nothing to fetch; skip the Secret
+            # Manager client and its network round-trips entirely
+            return (
+                init_settings,
+                env_settings,
+                dotenv_settings,
+                file_secret_settings,
+            )
+
         gcp_settings = GoogleSecretManagerSettingsSource(
             settings_cls,
             project_id=project_id,
@@ -92,5 +220,15 @@ class AppSettings(BaseSettings):
         )
 
 
-# Create application settings instance
-settings = AppSettings()
+@lru_cache(maxsize=1)
+def get_settings() -> AppSettings:
+    """Build the application settings once, on first use."""
+    return AppSettings()
+
+
+def __getattr__(name: str) -> Any:
+    # Keep `from wal_fact_checker.core.settings import settings` working while
+    # deferring AppSettings construction until it is actually imported
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
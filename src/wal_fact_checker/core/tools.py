@@ -5,16 +5,133 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Any
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, Final
 
 import httpx
+from cachetools import TTLCache
 from google.adk.tools import FunctionTool
 from groq import AsyncGroq
 
 from .settings import settings
 
 logger = logging.getLogger(__name__)
-groq_client = AsyncGroq(api_key=settings.groq_key)
+
+SCRAPE_DO_API_URL: Final[str] = "https://api.scrape.do"
+
+# Upper bound on concurrent requests sent to the scrape.do API
+MAX_CONCURRENT_SCRAPES: Final[int] = 10
+_scrape_semaphore = asyncio.Semaphore(MAX_CONCURRENT_SCRAPES)
+
+# TTL caches for repeated search queries and scraped URLs
+SEARCH_CACHE_TTL_SECONDS: Final[int] = 60 * 60
+SCRAPE_CACHE_TTL_SECONDS: Final[int] = 24 * 60 * 60
+CACHE_MAX_SIZE: Final[int] = 10_000
+_search_cache: TTLCache = TTLCache(maxsize=CACHE_MAX_SIZE, ttl=SEARCH_CACHE_TTL_SECONDS)
+_scrape_cache: TTLCache = TTLCache(maxsize=CACHE_MAX_SIZE, ttl=SCRAPE_CACHE_TTL_SECONDS)
+# In-flight fetches; concurrent misses for the same key share one request
+_in_flight: dict[Hashable, asyncio.Task[dict[str, Any]]] = {}
+
+# Shared HTTP/2 client so scrape requests reuse pooled keep-alive connections.
+# Research agents scrape once every few LLM turns, so idle connections are kept
+# well past httpx's 5 s default; connects fail fast instead of eating the
+# whole request timeout.
+HTTP_KEEPALIVE_EXPIRY_SECONDS: Final[float] = 60.0
+HTTP_CONNECT_TIMEOUT_SECONDS: Final[float] = 5.0
+_http_client: httpx.AsyncClient | None = None
+
+# Groq searches share one HTTP/2 connection instead of a pool of HTTP/1.1
+# connections, each with its own TLS handshake
+_groq_http_client = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(
+        max_connections=100,
+        max_keepalive_connections=20,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    ),
+)
+groq_client = AsyncGroq(api_key=settings.groq_key, http_client=_groq_http_client)
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide pooled HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            timeout=httpx.Timeout(
+                settings.default_timeout, connect=HTTP_CONNECT_TIMEOUT_SECONDS
+            ),
+        )
+    return _http_client
+
+
+async def _prewarm_connection(client: httpx.AsyncClient, url: str) -> None:
+    try:
+        await client.head(url)
+    except httpx.HTTPError:
+        logger.warning(
+            "Failed to pre-warm connection",
+            extra={"json_fields": {"url": url}},
+            exc_info=True,
+        )
+
+
+async def prewarm_http_client() -> None:
+    """Open the pooled scrape.do and Groq connections ahead of the first tool call."""
+    await asyncio.gather(
+        _prewarm_connection(get_http_client(), SCRAPE_DO_API_URL),
+        _prewarm_connection(_groq_http_client, str(groq_client.base_url)),
+    )
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP clients; called from the application shutdown hook."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+    await groq_client.close()
+
+
+async def _get_or_fetch(
+    cache: TTLCache,
+    key: Hashable,
+    fetch: Callable[[], Awaitable[dict[str, Any]]],
+) -> dict[str, Any]:
+    """Return a cached result or join the in-flight fetch for `key`.
+
+    Every concurrent caller awaits the same task, so a failed fetch is
+    reported to all of them at once instead of being retried by each in turn.
+    The fetch runs as its own task and survives the cancellation of the
+    caller that started it. Only successful results are cached.
+    """
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    flight_key = (id(cache), key)
+    task = _in_flight.get(flight_key)
+    if task is None:
+        task = asyncio.ensure_future(fetch())
+        _in_flight[flight_key] = task
+
+        def finish(done: asyncio.Task[dict[str, Any]]) -> None:
+            _in_flight.pop(flight_key, None)
+            if done.cancelled() or done.exception() is not None:
+                return
+            result = done.result()
+            if result.get("status") == "success":
+                cache[key] = result
+
+        task.add_done_callback(finish)
+
+    return await asyncio.shield(task)
 
 
 async def _scrape_single_website(
@@ -40,7 +157,7 @@ async def _scrape_single_website(
             "render": True,
         }
 
-        response = await client.get("https://api.scrape.do", params=params)
+        response = await client.get(SCRAPE_DO_API_URL, params=params)
         response.raise_for_status()
 
         # Get the markdown content from scrape.do
@@ -67,7 +184,7 @@ async def _scrape_single_website(
 
 
 async def scrape_tool(urls: list[str]) -> dict[str, Any]:
-    """Scrape content from multiple websites sequentially using scrape.do API.
+    """Scrape content from multiple websites concurrently using scrape.do API.
 
     Args:
         urls: List of URLs to scrape
@@ -83,27 +200,51 @@ async def scrape_tool(urls: list[str]) -> dict[str, Any]:
         }
 
     country_code = "US"  # Fixed default
-    delay_between_requests = 1.0  # Fixed default for safe scraping
-    results: list[dict[str, Any]] = []
-    successful_scrapes = 0
-    failed_scrapes = 0
+    client = get_http_client()
 
-    # Use a single HTTP client for all requests
-    async with httpx.AsyncClient(timeout=settings.default_timeout) as client:
-        for i, url in enumerate(urls):
-            # Add delay between requests (except for the first one)
-            if i > 0:
-                await asyncio.sleep(delay_between_requests)
+    async def scrape_bounded(url: str) -> dict[str, Any]:
+        async def fetch() -> dict[str, Any]:
+            async with _scrape_semaphore:
+                return await _scrape_single_website(url, country_code, client)
 
-            # Scrape individual website
-            result = await _scrape_single_website(url, country_code, client)
-            results.append(result)
+        return await _get_or_fetch(_scrape_cache, (url, country_code), fetch)
 
-            # Track success/failure
-            if result.get("status") == "success":
-                successful_scrapes += 1
-            else:
-                failed_scrapes += 1
+    # Fan out all URLs concurrently over the shared pooled client. Pages still
+    # loading at the deadline are dropped rather than stalling the agent; their
+    # shared fetches keep running and fill the cache for later calls.
+    tasks = [asyncio.ensure_future(scrape_bounded(url)) for url in urls]
+    try:
+        _, pending = await asyncio.wait(
+            tasks, timeout=settings.scrape_tool_timeout_seconds or None
+        )
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    # Turn unexpected failures into per-URL errors so one URL can't fail the batch
+    results: list[dict[str, Any]] = []
+    for url, task in zip(urls, tasks, strict=True):
+        if task in pending:
+            logger.warning(
+                "scrape_tool: URL timed out",
+                extra={"json_fields": {"url": url}},
+            )
+            results.append(
+                {"url": url, "error": "Timed out", "content": "", "status": "error"}
+            )
+        elif task.cancelled() or task.exception() is not None:
+            results.append(
+                {
+                    "url": url,
+                    "error": "Cancelled" if task.cancelled() else str(task.exception()),
+                    "content": "",
+                    "status": "error",
+                }
+            )
+        else:
+            results.append(task.result())
+
+    successful_scrapes = sum(1 for r in results if r.get("status") == "success")
 
     # Combine all successful content as dict with URLs as keys
     combined_content: dict[str, str] = {}
@@ -145,6 +286,15 @@ async def search_tool(query: str, country: str) -> dict[str, Any]:
                 * description: Content snippet or summary
                 * score: Relevance score from search engine
     """
+    return await _get_or_fetch(
+        _search_cache,
+        (query.strip().casefold(), country.strip().casefold()),
+        lambda: _search_uncached(query, country),
+    )
+
+
+async def _search_uncached(query: str, country: str) -> dict[str, Any]:
+    """Run a Groq Compound web search without consulting the cache."""
     try:
         system_prompt = (
             "You are a world-class fact-check searcher. Support Georgian and English. "
@@ -217,6 +367,9 @@ scrape_websites_tool = FunctionTool(scrape_tool)
 groq_search_tool = FunctionTool(search_tool)
 # Export all tools for easy import
 __all__ = [
+    "close_http_client",
+    "get_http_client",
     "groq_search_tool",
+    "prewarm_http_client",
     "scrape_websites_tool",
 ]
@@ -13,6 +13,8 @@ from ..core.settings import settings
 
 logger: Final = logging.getLogger(__name__)
 
+_initialized = False
+
 
 def _set_env_if_missing(key: str, value: str) -> None:
     """Set an environment variable if it's not already set and value is non-empty."""
@@ -28,16 +30,28 @@ def initialize_langfuse_tracing() -> None:
     This reads credentials from `app.core.settings.settings` and sets standard
     Langfuse environment variables if they are not already present. It then
     authenticates the client and instruments Google ADK so that agent/tool and
-    model spans are exported to Langfuse.
+    model spans are exported to Langfuse. Runs at most once per process and
+    is a no-op when Langfuse keys are not configured.
     """
+    global _initialized
+    if _initialized:
+        return
+    _initialized = True
+
     try:
+        # Optional: ensure Gemini key is available for ADK examples/tools
+        _set_env_if_missing("GOOGLE_API_KEY", settings.google_api_key)
+
         _set_env_if_missing("LANGFUSE_HOST", settings.langfuse_host)
         _set_env_if_missing("LANGFUSE_PUBLIC_KEY", settings.langfuse_public_key)
         _set_env_if_missing("LANGFUSE_SECRET_KEY", settings.langfuse_secret_key)
         _set_env_if_missing("LANGFUSE_ENV", settings.langfuse_tracing_environment)
 
-        # Optional: ensure Gemini key is available for ADK examples/tools
-        _set_env_if_missing("GOOGLE_API_KEY", settings.google_api_key)
+        if not os.environ.get("LANGFUSE_PUBLIC_KEY") or not os.environ.get(
+            "LANGFUSE_SECRET_KEY"
+        ):
+            logger.info("Langfuse keys not configured; skipping tracing setup")
+            return
 
         client = get_client()
         if client.auth_check():
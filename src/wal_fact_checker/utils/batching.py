@@ -0,0 +1,82 @@
+# File: src/wal_fact_checker/utils/batching.py
+"""Micro-batching of concurrent requests into a single call."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """Coalesce concurrent submissions into batches flushed after a short window.
+
+    Items are grouped by key; only items sharing a key are processed together.
+    A batch is flushed when `window_seconds` elapse after its first item or as
+    soon as it reaches `max_batch_size`. `process` must return one result per
+    item, in order; each caller awaits only its own result.
+    """
+
+    def __init__(
+        self,
+        process: Callable[[str, list[T]], Awaitable[list[R]]],
+        window_seconds: float,
+        max_batch_size: int,
+    ) -> None:
+        self.process = process
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self._pending: dict[str, list[tuple[T, asyncio.Future[R]]]] = {}
+        self._timers: dict[str, asyncio.Task[None]] = {}
+        self._running: set[asyncio.Task[None]] = set()
+
+    async def submit(self, key: str, item: T) -> R:
+        """Add `item` to the open batch for `key` and wait for its result."""
+        future: asyncio.Future[R] = asyncio.get_running_loop().create_future()
+        batch = self._pending.setdefault(key, [])
+        batch.append((item, future))
+
+        if len(batch) >= self.max_batch_size:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = asyncio.create_task(self._flush_after_window(key))
+        return await future
+
+    async def _flush_after_window(self, key: str) -> None:
+        await asyncio.sleep(self.window_seconds)
+        self._flush(key)
+
+    def _flush(self, key: str) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+
+        batch = self._pending.pop(key, [])
+        if not batch:
+            return
+        task = asyncio.create_task(self._run(key, batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, key: str, batch: list[tuple[T, asyncio.Future[R]]]) -> None:
+        try:
+            results = await self.process(key, [item for item, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(
+                    f"Batch of {len(batch)} items produced {len(results)} results"
+                )
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for (_, future), result in zip(batch, results, strict=True):
+            if not future.done():
+                future.set_result(result)
+
+
+__all__ = ["MicroBatcher"]
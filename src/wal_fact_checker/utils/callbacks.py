@@ -2,15 +2,76 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
+import re
+import time
+from collections.abc import Awaitable, Callable
 from datetime import datetime, timezone
 
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.models import LlmRequest, LlmResponse
 from google.genai import types
+from pydantic import BaseModel, ValidationError
+
+from wal_fact_checker.core.llm import get_gemini_model, get_gemini_semaphore
+from wal_fact_checker.core.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Recreate explicit caches this long before they expire server-side
+CONTEXT_CACHE_REFRESH_MARGIN_SECONDS = 60
+
+# Instruction hash -> (cache name or None if creation failed, monotonic expiry)
+_instruction_caches: dict[str, tuple[str | None, float]] = {}
+_instruction_cache_locks: dict[str, asyncio.Lock] = {}
+
+# Inputs at or below these sizes are structured without thinking
+EASY_INPUT_MAX_CHARS = 300
+EASY_INPUT_MAX_SENTENCES = 2
+MAX_PENDING_THINKING_FALLBACKS = 100
+# A fallback retry slower than this keeps the original response instead
+THINKING_FALLBACK_TIMEOUT_SECONDS = 60.0
+
+_SENTENCE_END_PATTERN = re.compile(r"[.!?]+(?=\s|$)")
+
+# Date frozen for one pipeline run; temp-scoped so reused sessions never see
+# yesterday's date
+PIPELINE_DATE_STATE_KEY = "temp:pipeline_date"
+
+BeforeModelCallback = Callable[
+    [CallbackContext, LlmRequest], Awaitable[LlmResponse | None]
+]
+AfterModelCallback = Callable[
+    [CallbackContext, LlmResponse], Awaitable[LlmResponse | None]
+]
+
+
+def _today_utc() -> str:
+    return datetime.now(timezone.utc).date().isoformat()
+
+
+def freeze_pipeline_date_before_agent(
+    callback_context: CallbackContext,
+) -> types.Content | None:
+    """
+    Record today's UTC date once at pipeline entry.
+
+    Every model call in the run then sees the same date, so date-prefixed
+    instructions stay byte-identical and keep hitting prompt and context
+    caches even when a run straddles midnight.
+
+    Args:
+        callback_context: Execution context for the callback.
+
+    Returns:
+        None to proceed with the agent run.
+    """
+    if PIPELINE_DATE_STATE_KEY not in callback_context.state:
+        callback_context.state[PIPELINE_DATE_STATE_KEY] = _today_utc()
+    return None
+
 
 def inject_current_date_before_model(
     callback_context: CallbackContext, llm_request: LlmRequest
@@ -18,6 +79,8 @@ def inject_current_date_before_model(
     """
     Prepend today's UTC date to the system instruction before model call.
 
+    Uses the date frozen at pipeline entry when present.
+
     Args:
         callback_context: Execution context for the callback.
         llm_request: Mutable LLM request that will be sent to the model.
@@ -25,7 +88,7 @@ def inject_current_date_before_model(
     Returns:
         None to proceed with the (possibly modified) request.
     """
-    today_utc = datetime.now(timezone.utc).date().isoformat()
+    today_utc = callback_context.state.get(PIPELINE_DATE_STATE_KEY) or _today_utc()
     header_prefix = f"Current date: {today_utc} (UTC).\n\n"
 
     system_instruction = llm_request.config.system_instruction or types.Content(
@@ -54,3 +117,230 @@ def inject_current_date_before_model(
         },
     )
     return None
+
+
+async def _get_instruction_cache(
+    model: str, system_instruction: types.Content, display_name: str
+) -> str | None:
+    """Return the explicit cache holding `system_instruction`, creating it once."""
+    instruction_text = "".join(
+        part.text or "" for part in system_instruction.parts or []
+    )
+    key = hashlib.sha256(f"{model}:{instruction_text}".encode()).hexdigest()
+
+    entry = _instruction_caches.get(key)
+    if entry is not None and time.monotonic() < entry[1]:
+        return entry[0]
+
+    async with _instruction_cache_locks.setdefault(key, asyncio.Lock()):
+        entry = _instruction_caches.get(key)
+        if entry is not None and time.monotonic() < entry[1]:
+            return entry[0]
+
+        ttl_seconds = settings.gemini_context_cache_ttl_seconds
+        expires_at = (
+            time.monotonic() + ttl_seconds - CONTEXT_CACHE_REFRESH_MARGIN_SECONDS
+        )
+        try:
+            async with get_gemini_semaphore():
+                client = get_gemini_model(model).api_client
+                cached_content = await client.aio.caches.create(
+                    model=model,
+                    config=types.CreateCachedContentConfig(
+                        system_instruction=system_instruction,
+                        ttl=f"{ttl_seconds}s",
+                        display_name=display_name,
+                    ),
+                )
+            cache_name = cached_content.name
+        except Exception:
+            # E.g. an instruction below the minimum cacheable size; don't retry
+            # until the entry would have expired anyway
+            logger.warning(
+                "Failed to create context cache",
+                exc_info=True,
+                extra={"json_fields": {"model": model, "agent": display_name}},
+            )
+            cache_name = None
+
+        _instruction_caches[key] = (cache_name, expires_at)
+        return cache_name
+
+
+async def use_cached_instruction_before_model(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> LlmResponse | None:
+    """
+    Serve the system instruction from an explicit Gemini context cache.
+
+    The static instruction is uploaded once per TTL and referenced by name,
+    so each call skips re-sending and re-processing it. Must run after every
+    callback that edits the system instruction; a changed instruction (new
+    date, prompt edit) hashes to a new cache.
+
+    Args:
+        callback_context: Execution context for the callback.
+        llm_request: Mutable LLM request that will be sent to the model.
+
+    Returns:
+        None to proceed with the (possibly modified) request.
+    """
+    if settings.gemini_context_cache_ttl_seconds <= 0:
+        return None
+    # Tools would have to live in the cache too; only instruction-only agents
+    if llm_request.config.tools or not llm_request.model:
+        return None
+
+    system_instruction = llm_request.config.system_instruction
+    if not isinstance(system_instruction, types.Content):
+        return None
+
+    cache_name = await _get_instruction_cache(
+        llm_request.model, system_instruction, callback_context.agent_name
+    )
+    if cache_name is None:
+        return None
+
+    llm_request.config.cached_content = cache_name
+    llm_request.config.system_instruction = None
+    return None
+
+
+def is_easy_input(text: str) -> bool:
+    """Return True for short inputs that likely hold at most a couple of claims."""
+    stripped = text.strip()
+    return (
+        len(stripped) <= EASY_INPUT_MAX_CHARS
+        and len(_SENTENCE_END_PATTERN.findall(stripped)) <= EASY_INPUT_MAX_SENTENCES
+    )
+
+
+async def _final_model_response(llm_request: LlmRequest) -> LlmResponse | None:
+    """Send `llm_request` to its model and return the last response."""
+    model = get_gemini_model(llm_request.model or "")
+    final_response: LlmResponse | None = None
+    async for llm_response in model.generate_content_async(llm_request):
+        final_response = llm_response
+    return final_response
+
+
+def create_adaptive_thinking_callbacks(
+    output_schema: type[BaseModel],
+    is_easy: Callable[[CallbackContext, LlmRequest], bool],
+    escalation_model: str | None = None,
+) -> tuple[BeforeModelCallback, AfterModelCallback]:
+    """
+    Create callbacks that skip thinking for easy requests.
+
+    The before-model callback sets a zero thinking budget when `is_easy`
+    accepts the request. If the response then fails `output_schema`
+    validation, the after-model callback re-issues the original request with
+    the agent's thinking budget and swaps in that response. With
+    `escalation_model` set, every request is checked and the retry goes to
+    that (stronger) model instead. The response is replaced in place so later
+    after-model callbacks still run; if the retry fails or times out, the
+    original response is kept.
+    """
+    # Requests that may need a retry, kept until their response is validated
+    pending_requests: dict[str, LlmRequest] = {}
+
+    async def route_thinking_budget(
+        callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> LlmResponse | None:
+        skip_thinking = llm_request.config.thinking_config is not None and is_easy(
+            callback_context, llm_request
+        )
+        if not skip_thinking and escalation_model is None:
+            return None
+
+        pending_requests[callback_context.invocation_id] = llm_request.model_copy(
+            deep=True
+        )
+        # Failed model calls never reach the after-callback; drop their entries
+        while len(pending_requests) > MAX_PENDING_THINKING_FALLBACKS:
+            pending_requests.pop(next(iter(pending_requests)))
+
+        if skip_thinking:
+            llm_request.config.thinking_config = types.ThinkingConfig(thinking_budget=0)
+            logger.info(
+                "route_thinking_budget: Skipping thinking for easy input",
+                extra={"json_fields": {"agent": callback_context.agent_name}},
+            )
+        return None
+
+    async def fall_back_to_thinking(
+        callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> LlmResponse | None:
+        if llm_response.partial:
+            return None
+
+        original_request = pending_requests.pop(callback_context.invocation_id, None)
+        if original_request is None:
+            return None
+
+        output_text = "".join(
+            part.text or ""
+            for part in (
+                llm_response.content.parts or [] if llm_response.content else []
+            )
+            if not part.thought
+        )
+        try:
+            output_schema.model_validate_json(output_text)
+            return None
+        except ValidationError:
+            pass
+
+        if escalation_model is not None:
+            original_request.model = escalation_model
+        logger.warning(
+            "fall_back_to_thinking: Response failed validation; retrying",
+            extra={
+                "json_fields": {
+                    "agent": callback_context.agent_name,
+                    "model": original_request.model,
+                }
+            },
+        )
+
+        try:
+            retry_response = await asyncio.wait_for(
+                _final_model_response(original_request),
+                timeout=THINKING_FALLBACK_TIMEOUT_SECONDS,
+            )
+        except Exception:
+            logger.warning(
+                "fall_back_to_thinking: Retry failed; keeping original response",
+                exc_info=True,
+                extra={
+                    "json_fields": {
+                        "agent": callback_context.agent_name,
+                        "model": original_request.model,
+                    }
+                },
+            )
+            return None
+
+        if retry_response is None:
+            return None
+        # An error from the retry (e.g. the escalation model's quota) would
+        # only replace a usable, if invalid, response with an empty one
+        if retry_response.error_code:
+            logger.warning(
+                "fall_back_to_thinking: Retry errored; keeping original response",
+                extra={
+                    "json_fields": {
+                        "agent": callback_context.agent_name,
+                        "model": original_request.model,
+                        "error_code": retry_response.error_code,
+                    }
+                },
+            )
+            return None
+
+        llm_response.content = retry_response.content
+        llm_response.usage_metadata = retry_response.usage_metadata
+        llm_response.finish_reason = retry_response.finish_reason
+        return None
+
+    return route_thinking_budget, fall_back_to_thinking
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import Literal
 
@@ -9,35 +10,61 @@ logger = logging.getLogger(__name__)
 
 gemini_client = Client(api_key=settings.gcp_genai_key)
 
+EmbeddingTaskType = Literal[
+    "SEMANTIC_SIMILARITY",
+    "CLASSIFICATION",
+    "CLUSTERING",
+    "RETRIEVAL_DOCUMENT",
+    "RETRIEVAL_QUERY",
+    "QUESTION_ANSWERING",
+    "FACT_VERIFICATION",
+]
+
 
 class EmbeddingService:
     """Service for generating title embeddings using Gemini text-embedding-001 model"""
 
     EMBEDDING_DIMENSIONS = 3072
+    # The embedding API accepts at most this many texts per request
+    MAX_TEXTS_PER_REQUEST = 100
 
     async def generate_embeddings(
         self,
         texts: list[str],
-        task_type: Literal[
-            "SEMANTIC_SIMILARITY",
-            "CLASSIFICATION",
-            "CLUSTERING",
-            "RETRIEVAL_DOCUMENT",
-            "RETRIEVAL_QUERY",
-            "QUESTION_ANSWERING",
-            "FACT_VERIFICATION",
-        ]
+        task_type: EmbeddingTaskType,
+        output_dimensionality: int | None = None,
     ) -> list[list[float]]:
-        """Generate embeddings for multiple texts asynchronously"""
+        """Generate embeddings for multiple texts asynchronously
+
+        `output_dimensionality` truncates the embeddings (Matryoshka); truncated
+        vectors are not unit length and must be normalized before cosine use.
+        Larger inputs are split into concurrent requests of at most
+        MAX_TEXTS_PER_REQUEST texts.
+        """
         if not texts:
             return []
 
+        if len(texts) > self.MAX_TEXTS_PER_REQUEST:
+            batches = await asyncio.gather(
+                *(
+                    self.generate_embeddings(
+                        texts[start : start + self.MAX_TEXTS_PER_REQUEST],
+                        task_type,
+                        output_dimensionality,
+                    )
+                    for start in range(0, len(texts), self.MAX_TEXTS_PER_REQUEST)
+                )
+            )
+            return [embedding for batch in batches for embedding in batch]
+
+        dimensions = output_dimensionality or self.EMBEDDING_DIMENSIONS
+
         try:
             response = await gemini_client.aio.models.embed_content(
                 model="gemini-embedding-001",
                 contents=texts,
                 config=types.EmbedContentConfig(
-                    output_dimensionality=self.EMBEDDING_DIMENSIONS,
+                    output_dimensionality=dimensions,
                     task_type=task_type,
                 ),
             )
@@ -68,7 +95,7 @@ class EmbeddingService:
                 },
             )
             # Return zero vectors as fallback
-            return [[0.0] * self.EMBEDDING_DIMENSIONS for _ in texts]
+            return [[0.0] * dimensions for _ in texts]
 
 
 embedding_service = EmbeddingService()
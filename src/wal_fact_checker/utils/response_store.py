@@ -0,0 +1,90 @@
+# File: src/wal_fact_checker/utils/response_store.py
+"""Disk-backed content-addressed store for deterministic model outputs."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import time
+from functools import cache
+from pathlib import Path
+
+from wal_fact_checker.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def content_key(*parts: str) -> str:
+    """Return a BLAKE2b digest addressing the content of `parts`."""
+    digest = hashlib.blake2b(digest_size=32)
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ResponseStore:
+    """SQLite key-value store whose entries survive process restarts.
+
+    Reruns over identical inputs (evaluations, retries, backtests) then skip
+    the model entirely. Reads are indexed point lookups on a local file and
+    run inline; WAL mode keeps commits from waiting on fsync.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._db: sqlite3.Connection | None = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._db is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.path, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db = db
+        return self._db
+
+    def get(self, key: str) -> str | None:
+        """Return the stored value for `key`, or None if absent or expired."""
+        try:
+            db = self._connection()
+            row = db.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at < time.time():
+                db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            return value
+        except sqlite3.Error:
+            logger.warning("ResponseStore: Read failed", exc_info=True)
+            return None
+
+    def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        """Store `value` under `key` for `ttl_seconds`."""
+        try:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at) "
+                "VALUES (?, ?, ?)",
+                (key, value, time.time() + ttl_seconds),
+            )
+        except sqlite3.Error:
+            logger.warning("ResponseStore: Write failed", exc_info=True)
+
+
+@cache
+def get_response_store() -> ResponseStore | None:
+    """Return the shared store, or None when persistence is not configured."""
+    if not settings.response_store_path:
+        return None
+    return ResponseStore(settings.response_store_path)
+
+
+__all__ = ["ResponseStore", "content_key", "get_response_store"]
@@ -0,0 +1,108 @@
+# File: src/wal_fact_checker/utils/semantic_cache.py
+"""In-process semantic cache keyed by text embeddings."""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from wal_fact_checker.utils.text import extract_numbers
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _CacheEntry:
+    namespace: str
+    text: str
+    vector: NDArray[np.float32]
+    value: Any
+    expires_at: float | None
+
+
+class SemanticCache:
+    """LRU-bounded cache that returns values stored for near-duplicate texts.
+
+    Entries are grouped by namespace (e.g. model + prompt hash) so prompt edits
+    never serve stale outputs. A hit requires cosine similarity at or above
+    `threshold` and the same numbers in both texts, since embeddings barely
+    separate texts that differ only in a figure or date. Entries older than
+    `ttl_seconds`, when given, are never returned.
+    """
+
+    def __init__(
+        self, threshold: float, max_entries: int, ttl_seconds: float | None = None
+    ) -> None:
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[int, _CacheEntry] = OrderedDict()
+        self._next_id = 0
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> NDArray[np.float32] | None:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0:
+            return None
+        return vector / norm
+
+    def get(self, namespace: str, text: str, embedding: Sequence[float]) -> Any:
+        """Return the cached value for a near-duplicate of `text`, or None."""
+        vector = self._normalize(embedding)
+        if vector is None:
+            return None
+
+        now = time.monotonic()
+        candidates = [
+            (entry_id, entry)
+            for entry_id, entry in self._entries.items()
+            if entry.namespace == namespace
+            and (entry.expires_at is None or entry.expires_at > now)
+        ]
+        if not candidates:
+            return None
+
+        matrix = np.stack([entry.vector for _, entry in candidates])
+        similarities = matrix @ vector
+        best = int(np.argmax(similarities))
+        best_id, best_entry = candidates[best]
+        similarity = float(similarities[best])
+
+        if similarity < self.threshold:
+            return None
+        if extract_numbers(text) != extract_numbers(best_entry.text):
+            return None
+
+        self._entries.move_to_end(best_id)
+        logger.info(
+            "SemanticCache: Hit",
+            extra={"json_fields": {"namespace": namespace, "similarity": similarity}},
+        )
+        return best_entry.value
+
+    def put(
+        self, namespace: str, text: str, embedding: Sequence[float], value: Any
+    ) -> None:
+        """Store `value` for `text`, evicting the least recently used entry."""
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        self._entries[self._next_id] = _CacheEntry(
+            namespace, text, vector, value, expires_at
+        )
+        self._next_id += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+__all__ = ["SemanticCache"]
@@ -0,0 +1,29 @@
+# File: src/wal_fact_checker/utils/text.py
+"""Text normalization helpers for cache keys."""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+
+_NUMBER_PATTERN = re.compile(r"\d+(?:[.,]\d+)*")
+_TRAILING_PUNCTUATION = " .,;:!?"
+
+
+def normalize_claim(text: str) -> str:
+    """Normalize claim text so trivially different spellings share a key.
+
+    Applies NFKC, lowercases, collapses whitespace and strips trailing
+    punctuation. Uses str builtins rather than regex passes, since this runs
+    for every claim on every cache lookup.
+    """
+    normalized = " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+    return normalized.rstrip(_TRAILING_PUNCTUATION)
+
+
+def extract_numbers(text: str) -> list[str]:
+    """Return the numbers in `text` (e.g. "1,200", "3.5", "2024"), in order."""
+    return _NUMBER_PATTERN.findall(text)
+
+
+__all__ = ["extract_numbers", "normalize_claim"]